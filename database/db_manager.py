@@ -1,7 +1,10 @@
 """
 Менеджер базы данных
 """
+import atexit
+import contextlib
 import sqlite3
+import threading
 from datetime import datetime
 
 
@@ -10,152 +13,332 @@ class DatabaseManager:
 
     DB_NAME = "game_data.db"
 
-    def __init__(self):
+    # Интервал фоновой записи накопленной статистики (секунды)
+    FLUSH_INTERVAL = 2.0
+
+    # Поля player_stats, которые можно увеличивать через очередь
+    STAT_COLUMNS = (
+        "total_deaths",
+        "total_coins_collected",
+        "total_enemies_killed",
+        "total_games_played",
+        "total_playtime",
+    )
+
+    def __init__(self, write_behind=False):
         self.connection = None
         self.cursor = None
 
+        # Режим write-behind: одно постоянное соединение и очередь статистики
+        self.write_behind = write_behind
+        self._lock = threading.RLock()
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._writer = None
+
+        if self.write_behind:
+            self._start_writer()
+
     def connect(self):
         """Подключение к базе данных"""
+        if self.write_behind:
+            # Постоянное соединение общее для GUI и фонового потока,
+            # поэтому на время работы с ним захватываем блокировку
+            self._lock.acquire()
+            try:
+                if self.connection is None:
+                    self.connection = sqlite3.connect(
+                        self.DB_NAME, check_same_thread=False
+                    )
+                    self.cursor = self.connection.cursor()
+            except BaseException:
+                self._lock.release()
+                raise
+            return
+
         self.connection = sqlite3.connect(self.DB_NAME)
         self.cursor = self.connection.cursor()
 
     def disconnect(self):
         """Отключение от базы данных"""
+        if self.write_behind:
+            # Соединение остаётся открытым до close()
+            self._lock.release()
+            return
+
         if self.connection:
             self.connection.close()
 
-    def init_database(self):
-        """Инициализация базы данных"""
+    @contextlib.contextmanager
+    def connected(self):
+        """Подключение на время блока with
+
+        Отключение выполняется и при ошибке sqlite: иначе в режиме
+        write-behind блокировка соединения осталась бы захваченной, и
+        фоновая запись и close() при выходе ждали бы её бесконечно.
+        Незавершённая транзакция при ошибке откатывается.
+        """
         self.connect()
+        try:
+            yield
+        except sqlite3.Error:
+            self.connection.rollback()
+            raise
+        finally:
+            self.disconnect()
+
+    def close(self):
+        """Запись очереди и закрытие постоянного соединения"""
+        if not self.write_behind:
+            return
+
+        self._stop_event.set()
+        if self._writer and self._writer is not threading.current_thread():
+            self._writer.join()
+        self._writer = None
+
+        self.flush()
+
+        with self._lock:
+            if self.connection:
+                self.connection.close()
+                self.connection = None
+                self.cursor = None
+
+        atexit.unregister(self.close)
 
-        # Таблица 1: Результаты игроков
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS players (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                score INTEGER NOT NULL,
-                level INTEGER NOT NULL,
-                play_time INTEGER NOT NULL,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        # Таблица 2: Статистика уровней
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS level_stats (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                level_number INTEGER NOT NULL UNIQUE,
-                completed_times INTEGER DEFAULT 0,
-                best_time INTEGER DEFAULT 9999
-            )
-        """)
-
-        # Таблица 3: Детальная статистика игрока
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS player_stats (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                player_name TEXT NOT NULL UNIQUE,
-                total_deaths INTEGER DEFAULT 0,
-                total_coins_collected INTEGER DEFAULT 0,
-                total_enemies_killed INTEGER DEFAULT 0,
-                total_games_played INTEGER DEFAULT 0,
-                total_playtime INTEGER DEFAULT 0,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        # Заполняем начальные данные для уровней
-        for level_num in [1, 2, 3]:
+    # ========================================================================
+    # ОЧЕРЕДЬ СТАТИСТИКИ (WRITE-BEHIND)
+    # ========================================================================
+
+    def _start_writer(self):
+        """Запуск фонового потока записи статистики"""
+        self._stop_event.clear()
+        self._writer = threading.Thread(
+            target=self._writer_loop,
+            name="stats-writer",
+            daemon=True
+        )
+        self._writer.start()
+
+        # Гарантия записи очереди при выходе из программы
+        atexit.register(self.close)
+
+    def _writer_loop(self):
+        """Периодическая запись очереди одной транзакцией"""
+        while not self._stop_event.wait(self.FLUSH_INTERVAL):
+            try:
+                self.flush()
+            except sqlite3.Error:
+                # Приращения остались в очереди, повторим на следующем цикле
+                pass
+
+    def _enqueue(self, player_name, column=None, amount=0):
+        """Добавление приращения статистики в очередь"""
+        with self._pending_lock:
+            deltas = self._pending.setdefault(player_name, {})
+            if column:
+                deltas[column] = deltas.get(column, 0) + amount
+
+    def flush(self):
+        """Запись накопленной статистики в базу одной транзакцией"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+
+        if not pending:
+            return
+
+        try:
+            with self.connected():
+                self.cursor.executemany("""
+                    INSERT OR IGNORE INTO player_stats (player_name)
+                    VALUES (?)
+                """, [(player_name,) for player_name in pending])
+
+                for player_name, deltas in pending.items():
+                    if not deltas:
+                        continue
+
+                    columns = [column for column in self.STAT_COLUMNS if column in deltas]
+                    assignments = ", ".join(f"{column} = {column} + ?" for column in columns)
+                    self.cursor.execute(f"""
+                        UPDATE player_stats
+                        SET {assignments},
+                            updated_at = CURRENT_TIMESTAMP
+                        WHERE player_name = ?
+                    """, [deltas[column] for column in columns] + [player_name])
+
+                self.connection.commit()
+        except sqlite3.Error:
+            # Возвращаем несохранённые приращения обратно в очередь
+            with self._pending_lock:
+                for player_name, deltas in pending.items():
+                    queued = self._pending.setdefault(player_name, {})
+                    for column, amount in deltas.items():
+                        queued[column] = queued.get(column, 0) + amount
+            raise
+
+    def init_database(self):
+        """Инициализация базы данных"""
+        with self.connected():
+            # Таблица 1: Результаты игроков
             self.cursor.execute("""
-                INSERT OR IGNORE INTO level_stats (level_number)
-                VALUES (?)
-            """, (level_num,))
+                CREATE TABLE IF NOT EXISTS players (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    score INTEGER NOT NULL,
+                    level INTEGER NOT NULL,
+                    play_time INTEGER NOT NULL,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # Таблица 2: Статистика уровней
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS level_stats (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    level_number INTEGER NOT NULL UNIQUE,
+                    completed_times INTEGER DEFAULT 0,
+                    best_time INTEGER DEFAULT 9999
+                )
+            """)
+
+            # Таблица 3: Детальная статистика игрока
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS player_stats (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    player_name TEXT NOT NULL UNIQUE,
+                    total_deaths INTEGER DEFAULT 0,
+                    total_coins_collected INTEGER DEFAULT 0,
+                    total_enemies_killed INTEGER DEFAULT 0,
+                    total_games_played INTEGER DEFAULT 0,
+                    total_playtime INTEGER DEFAULT 0,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # Индекс для таблицы рекордов
+            # (player_stats.player_name уже проиндексирован через UNIQUE)
+            self.cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_players_score_time
+                ON players (score DESC, play_time)
+            """)
+
+            # Заполняем начальные данные для уровней
+            for level_num in [1, 2, 3]:
+                self.cursor.execute("""
+                    INSERT OR IGNORE INTO level_stats (level_number)
+                    VALUES (?)
+                """, (level_num,))
 
-        self.connection.commit()
-        self.disconnect()
+            self.connection.commit()
 
     def add_player_score(self, name, score, level, play_time):
         """Добавление результата игрока"""
-        self.connect()
-
-        self.cursor.execute("""
-            INSERT INTO players (name, score, level, play_time)
-            VALUES (?, ?, ?, ?)
-        """, (name, score, level, play_time))
+        with self.connected():
+            self.cursor.execute("""
+                INSERT INTO players (name, score, level, play_time)
+                VALUES (?, ?, ?, ?)
+            """, (name, score, level, play_time))
 
-        self.connection.commit()
-        self.disconnect()
+            self.connection.commit()
 
     def get_top_scores(self, limit=10):
         """Получение топ результатов"""
-        self.connect()
+        with self.connected():
+            self.cursor.execute("""
+                SELECT id, name, score, level, play_time, created_at
+                FROM players
+                ORDER BY score DESC, play_time ASC
+                LIMIT ?
+            """, (limit,))
 
-        self.cursor.execute("""
-            SELECT id, name, score, level, play_time, created_at
-            FROM players
-            ORDER BY score DESC, play_time ASC
-            LIMIT ?
-        """, (limit,))
+            results = self.cursor.fetchall()
 
-        results = self.cursor.fetchall()
-        self.disconnect()
+        return results
+
+    def get_leaderboard_page(self, after=None, limit=100):
+        """Получение страницы таблицы рекордов после ключа (score, play_time, id)"""
+        # Сначала записываем ещё не сохранённые приращения
+        self.flush()
+
+        with self.connected():
+            if after is None:
+                condition = ""
+                params = (limit,)
+            else:
+                # Условие по score позволяет начать обход индекса сразу с нужного места
+                score, play_time, player_id = after
+                condition = """
+                WHERE p.score <= ?
+                  AND NOT (p.score = ? AND (p.play_time < ?
+                           OR (p.play_time = ? AND p.id <= ?)))
+                """
+                params = (score, score, play_time, play_time, player_id, limit)
+
+            self.cursor.execute(f"""
+                SELECT p.id, p.name, p.score, p.level, p.play_time, p.created_at,
+                       COALESCE(s.total_coins_collected, 0),
+                       COALESCE(s.total_enemies_killed, 0),
+                       COALESCE(s.total_deaths, 0)
+                FROM players AS p
+                LEFT JOIN player_stats AS s ON s.player_name = p.name
+                {condition}
+                ORDER BY p.score DESC, p.play_time ASC, p.id ASC
+                LIMIT ?
+            """, params)
+
+            results = self.cursor.fetchall()
 
         return results
 
     def increment_level_completions(self, level_number):
         """Увеличение счётчика прохождений уровня"""
-        self.connect()
-
-        self.cursor.execute("""
-            UPDATE level_stats
-            SET completed_times = completed_times + 1
-            WHERE level_number = ?
-        """, (level_number,))
+        with self.connected():
+            self.cursor.execute("""
+                UPDATE level_stats
+                SET completed_times = completed_times + 1
+                WHERE level_number = ?
+            """, (level_number,))
 
-        self.connection.commit()
-        self.disconnect()
+            self.connection.commit()
 
     def update_level_best_time(self, level_number, time):
         """Обновление лучшего времени уровня"""
-        self.connect()
-
-        self.cursor.execute("""
-            UPDATE level_stats
-            SET best_time = MIN(best_time, ?)
-            WHERE level_number = ?
-        """, (time, level_number))
+        with self.connected():
+            self.cursor.execute("""
+                UPDATE level_stats
+                SET best_time = MIN(best_time, ?)
+                WHERE level_number = ?
+            """, (time, level_number))
 
-        self.connection.commit()
-        self.disconnect()
+            self.connection.commit()
 
     def get_level_stats(self, level_number):
         """Получение статистики уровня"""
-        self.connect()
-
-        self.cursor.execute("""
-            SELECT completed_times, best_time
-            FROM level_stats
-            WHERE level_number = ?
-        """, (level_number,))
+        with self.connected():
+            self.cursor.execute("""
+                SELECT completed_times, best_time
+                FROM level_stats
+                WHERE level_number = ?
+            """, (level_number,))
 
-        result = self.cursor.fetchone()
-        self.disconnect()
+            result = self.cursor.fetchone()
 
         return result
 
     def get_all_level_stats(self):
         """Получение статистики всех уровней"""
-        self.connect()
-
-        self.cursor.execute("""
-            SELECT level_number, completed_times, best_time
-            FROM level_stats
-            ORDER BY level_number
-        """)
+        with self.connected():
+            self.cursor.execute("""
+                SELECT level_number, completed_times, best_time
+                FROM level_stats
+                ORDER BY level_number
+            """)
 
-        results = self.cursor.fetchall()
-        self.disconnect()
+            results = self.cursor.fetchall()
 
         return results
 
@@ -165,153 +348,168 @@ class DatabaseManager:
 
     def init_player_stats(self, player_name):
         """Инициализация статистики для нового игрока"""
-        self.connect()
+        if self.write_behind:
+            self._enqueue(player_name)
+            return
 
-        self.cursor.execute("""
-            INSERT OR IGNORE INTO player_stats (player_name)
-            VALUES (?)
-        """, (player_name,))
+        with self.connected():
+            self.cursor.execute("""
+                INSERT OR IGNORE INTO player_stats (player_name)
+                VALUES (?)
+            """, (player_name,))
 
-        self.connection.commit()
-        self.disconnect()
+            self.connection.commit()
 
     def add_death(self, player_name):
         """Добавление смерти игроку"""
-        self.connect()
+        if self.write_behind:
+            self._enqueue(player_name, "total_deaths", 1)
+            return
 
-        self.cursor.execute("""
-            INSERT OR IGNORE INTO player_stats (player_name)
-            VALUES (?)
-        """, (player_name,))
+        with self.connected():
+            self.cursor.execute("""
+                INSERT OR IGNORE INTO player_stats (player_name)
+                VALUES (?)
+            """, (player_name,))
 
-        self.cursor.execute("""
-            UPDATE player_stats
-            SET total_deaths = total_deaths + 1,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE player_name = ?
-        """, (player_name,))
+            self.cursor.execute("""
+                UPDATE player_stats
+                SET total_deaths = total_deaths + 1,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE player_name = ?
+            """, (player_name,))
 
-        self.connection.commit()
-        self.disconnect()
+            self.connection.commit()
 
     def add_coin(self, player_name, count=1):
         """Добавление собранных монет"""
-        self.connect()
+        if self.write_behind:
+            self._enqueue(player_name, "total_coins_collected", count)
+            return
 
-        self.cursor.execute("""
-            INSERT OR IGNORE INTO player_stats (player_name)
-            VALUES (?)
-        """, (player_name,))
+        with self.connected():
+            self.cursor.execute("""
+                INSERT OR IGNORE INTO player_stats (player_name)
+                VALUES (?)
+            """, (player_name,))
 
-        self.cursor.execute("""
-            UPDATE player_stats
-            SET total_coins_collected = total_coins_collected + ?,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE player_name = ?
-        """, (count, player_name))
+            self.cursor.execute("""
+                UPDATE player_stats
+                SET total_coins_collected = total_coins_collected + ?,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE player_name = ?
+            """, (count, player_name))
 
-        self.connection.commit()
-        self.disconnect()
+            self.connection.commit()
 
     def add_kill(self, player_name, count=1):
         """Добавление убитых врагов"""
-        self.connect()
+        if self.write_behind:
+            self._enqueue(player_name, "total_enemies_killed", count)
+            return
 
-        self.cursor.execute("""
-            INSERT OR IGNORE INTO player_stats (player_name)
-            VALUES (?)
-        """, (player_name,))
+        with self.connected():
+            self.cursor.execute("""
+                INSERT OR IGNORE INTO player_stats (player_name)
+                VALUES (?)
+            """, (player_name,))
 
-        self.cursor.execute("""
-            UPDATE player_stats
-            SET total_enemies_killed = total_enemies_killed + ?,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE player_name = ?
-        """, (count, player_name))
+            self.cursor.execute("""
+                UPDATE player_stats
+                SET total_enemies_killed = total_enemies_killed + ?,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE player_name = ?
+            """, (count, player_name))
 
-        self.connection.commit()
-        self.disconnect()
+            self.connection.commit()
 
     def increment_games_played(self, player_name):
         """Увеличение счётчика сыгранных игр"""
-        self.connect()
+        if self.write_behind:
+            self._enqueue(player_name, "total_games_played", 1)
+            return
 
-        self.cursor.execute("""
-            INSERT OR IGNORE INTO player_stats (player_name)
-            VALUES (?)
-        """, (player_name,))
+        with self.connected():
+            self.cursor.execute("""
+                INSERT OR IGNORE INTO player_stats (player_name)
+                VALUES (?)
+            """, (player_name,))
 
-        self.cursor.execute("""
-            UPDATE player_stats
-            SET total_games_played = total_games_played + 1,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE player_name = ?
-        """, (player_name,))
+            self.cursor.execute("""
+                UPDATE player_stats
+                SET total_games_played = total_games_played + 1,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE player_name = ?
+            """, (player_name,))
 
-        self.connection.commit()
-        self.disconnect()
+            self.connection.commit()
 
     def add_playtime(self, player_name, seconds):
         """Добавление времени игры"""
-        self.connect()
+        if self.write_behind:
+            self._enqueue(player_name, "total_playtime", seconds)
+            return
 
-        self.cursor.execute("""
-            INSERT OR IGNORE INTO player_stats (player_name)
-            VALUES (?)
-        """, (player_name,))
+        with self.connected():
+            self.cursor.execute("""
+                INSERT OR IGNORE INTO player_stats (player_name)
+                VALUES (?)
+            """, (player_name,))
 
-        self.cursor.execute("""
-            UPDATE player_stats
-            SET total_playtime = total_playtime + ?,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE player_name = ?
-        """, (seconds, player_name))
+            self.cursor.execute("""
+                UPDATE player_stats
+                SET total_playtime = total_playtime + ?,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE player_name = ?
+            """, (seconds, player_name))
 
-        self.connection.commit()
-        self.disconnect()
+            self.connection.commit()
 
     def get_player_stats(self, player_name):
         """Получение статистики конкретного игрока"""
-        self.connect()
+        # Сначала записываем ещё не сохранённые приращения
+        self.flush()
 
-        self.cursor.execute("""
-            SELECT total_deaths, total_coins_collected, total_enemies_killed,
-                   total_games_played, total_playtime
-            FROM player_stats
-            WHERE player_name = ?
-        """, (player_name,))
+        with self.connected():
+            self.cursor.execute("""
+                SELECT total_deaths, total_coins_collected, total_enemies_killed,
+                       total_games_played, total_playtime
+                FROM player_stats
+                WHERE player_name = ?
+            """, (player_name,))
 
-        result = self.cursor.fetchone()
-        self.disconnect()
+            result = self.cursor.fetchone()
 
         return result if result else (0, 0, 0, 0, 0)
 
     def get_all_players_stats(self):
         """Получение статистики всех игроков"""
-        self.connect()
+        # Сначала записываем ещё не сохранённые приращения
+        self.flush()
 
-        self.cursor.execute("""
-            SELECT player_name, total_deaths, total_coins_collected,
-                   total_enemies_killed, total_games_played, total_playtime
-            FROM player_stats
-            ORDER BY total_games_played DESC
-        """)
+        with self.connected():
+            self.cursor.execute("""
+                SELECT player_name, total_deaths, total_coins_collected,
+                       total_enemies_killed, total_games_played, total_playtime
+                FROM player_stats
+                ORDER BY total_games_played DESC
+            """)
 
-        results = self.cursor.fetchall()
-        self.disconnect()
+            results = self.cursor.fetchall()
 
         return results
 
     def clear_all_stats(self):
         """Очистка всей статистики"""
-        self.connect()
+        with self._pending_lock:
+            self._pending.clear()
 
-        self.cursor.execute("DELETE FROM players")
-        self.cursor.execute("""
-            UPDATE level_stats 
-            SET completed_times = 0, best_time = 9999
-        """)
-        self.cursor.execute("DELETE FROM player_stats")
+        with self.connected():
+            self.cursor.execute("DELETE FROM players")
+            self.cursor.execute("""
+                UPDATE level_stats 
+                SET completed_times = 0, best_time = 9999
+            """)
+            self.cursor.execute("DELETE FROM player_stats")
 
-        self.connection.commit()
-        self.disconnect()
+            self.connection.commit()
@@ -0,0 +1,152 @@
+"""
+Пакетные элементы сцены: много одинаковых объектов в одном QGraphicsItem
+"""
+from PyQt6 import sip
+from PyQt6.QtCore import QPointF, QRectF, Qt
+from PyQt6.QtGui import QPainter, QPixmap
+from PyQt6.QtWidgets import QGraphicsItem
+from game import styles
+from game.collision import PEN_MARGIN
+
+
+class RectBatch(QGraphicsItem):
+    """Прямоугольники одной роли (платформы), нарисованные одним drawRects
+
+    Прямоугольники хранятся в массиве QRectF, а сцена обходит и
+    перерисовывает один элемент вместо элемента на каждый объект.
+    """
+
+    def __init__(self, role):
+        super().__init__()
+        self.role = role
+        self.rects = sip.array(QRectF, 0)
+        self.bounds = QRectF()
+
+    def set_instances(self, states):
+        """Новый набор объектов (состояния с x, y, width, height)"""
+        self.prepareGeometryChange()
+        self.rects = sip.array(QRectF, len(states))
+
+        bounds = QRectF()
+        for index, state in enumerate(states):
+            rect = self.rects[index]
+            rect.setRect(state.x, state.y, state.width, state.height)
+            bounds = bounds.united(rect)
+
+        # Контур шире прямоугольника на половину толщины пера
+        self.bounds = bounds.adjusted(-PEN_MARGIN, -PEN_MARGIN, PEN_MARGIN, PEN_MARGIN)
+        self.update()
+
+    def boundingRect(self):
+        """Общий прямоугольник всех объектов"""
+        return self.bounds
+
+    def paint(self, painter, option, widget=None):
+        """Отрисовка всех прямоугольников за один вызов"""
+        painter.setBrush(styles.brush(self.role))
+        painter.setPen(styles.pen())
+        painter.drawRects(self.rects)
+
+
+class SpriteBatch(QGraphicsItem):
+    """Одинаковые эллипсы одной роли (монеты) из одной заготовки
+
+    Эллипс с контуром рисуется в картинку один раз, а объекты выводятся
+    вызовами drawPixmapFragments из массивов фрагментов - по массиву на
+    квадрат TILE_SIZE, чтобы при частичной перерисовке обходить только
+    открытые квадраты. Убранный объект не удаляется из сцены: у его
+    фрагмента обнуляется непрозрачность.
+    """
+
+    TILE_SIZE = 128
+
+    def __init__(self, role, size):
+        super().__init__()
+        self.role = role
+        self.size = size
+
+        # Перерисовывается только открытая часть (option.exposedRect)
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption)
+
+        # Заготовка с полем под контур
+        self.margin = PEN_MARGIN
+        sprite_size = size + 2 * self.margin
+        self.sprite = QPixmap(sprite_size, sprite_size)
+        self.sprite.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(self.sprite)
+        painter.setBrush(styles.brush(role))
+        painter.setPen(styles.pen())
+        painter.drawEllipse(QRectF(self.margin, self.margin, size, size))
+        painter.end()
+
+        # Квадрат (столбец, строка) -> массив фрагментов
+        self.tiles = {}
+
+        # Состояние -> (квадрат, номер фрагмента)
+        self.indices = {}
+        self.bounds = QRectF()
+
+    def set_instances(self, states):
+        """Новый набор объектов (состояния с x, y левого верхнего угла)"""
+        self.prepareGeometryChange()
+
+        half = self.size / 2
+        grouped = {}
+        for state in states:
+            tile = (
+                int((state.x + half) // self.TILE_SIZE),
+                int((state.y + half) // self.TILE_SIZE)
+            )
+            grouped.setdefault(tile, []).append(state)
+
+        source = QRectF(0, 0, self.sprite.width(), self.sprite.height())
+        self.tiles = {}
+        self.indices = {}
+        bounds = QRectF()
+        for tile, tile_states in grouped.items():
+            fragments = self.tiles[tile] = sip.array(QPainter.PixmapFragment, len(tile_states))
+            for index, state in enumerate(tile_states):
+                # Фрагмент задаётся центром
+                fragments[index] = QPainter.PixmapFragment.create(
+                    QPointF(state.x + half, state.y + half), source
+                )
+                self.indices[state] = (tile, index)
+                bounds = bounds.united(self._instance_rect(state))
+
+        self.bounds = bounds
+        self.update()
+
+    def hide_instance(self, state):
+        """Скрытие одного объекта (например, собранной монеты)"""
+        position = self.indices.pop(state, None)
+        if position is None:
+            return
+        tile, index = position
+        self.tiles[tile][index].opacity = 0
+        self.update(self._instance_rect(state))
+
+    def _instance_rect(self, state):
+        """Прямоугольник объекта вместе с контуром"""
+        return QRectF(
+            state.x - self.margin, state.y - self.margin,
+            self.sprite.width(), self.sprite.height()
+        )
+
+    def boundingRect(self):
+        """Общий прямоугольник всех объектов"""
+        return self.bounds
+
+    def paint(self, painter, option, widget=None):
+        """Отрисовка объектов открытых квадратов - вызов на квадрат"""
+        # Квадрат выбирается по центру объекта, а объект выступает
+        # за центр на половину заготовки
+        reach = self.sprite.width() / 2
+        exposed = option.exposedRect.adjusted(-reach, -reach, reach, reach)
+        first_column = int(exposed.left() // self.TILE_SIZE)
+        last_column = int(exposed.right() // self.TILE_SIZE)
+        first_row = int(exposed.top() // self.TILE_SIZE)
+        last_row = int(exposed.bottom() // self.TILE_SIZE)
+
+        for (column, row), fragments in self.tiles.items():
+            if first_column <= column <= last_column and first_row <= row <= last_row:
+                painter.drawPixmapFragments(fragments, self.sprite)
@@ -0,0 +1,313 @@
+"""
+Боты для оценки сложности уровней: массовые прогоны без графики
+
+Каждый эпизод - прохождение одного уровня ботом по правилам World
+(три жизни, как в GameWindow): смерть перезапускает уровень, после
+третьей смерти или лимита тиков эпизод проигран. Эпизоды распределяются
+по процессам, результаты построчно пишутся в JSON Lines сразу по
+готовности, а в конце печатается сводка по уровням и ботам.
+
+    python -m game.bots --levels 1 2 3 --episodes 1000 --out bots.jsonl
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+from game.profiler import FrameProfiler
+from game.world import (
+    World, InputFrame, PlayerState, EVENT_DAMAGE, EVENT_KILL, EVENT_COIN,
+    EVENT_DEATH, EVENT_LEVEL_COMPLETE
+)
+
+
+TICKS_PER_SECOND = 60
+LIVES = 3
+
+RESULT_CLEARED = "cleared"
+RESULT_GAME_OVER = "game_over"
+RESULT_TIMEOUT = "timeout"
+
+
+class RandomPolicy:
+    """Случайные действия, каждое удерживается несколько тиков"""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.frame = InputFrame()
+        self.hold = 0
+
+    def act(self, world):
+        """Ввод на очередной тик"""
+        if self.hold <= 0:
+            rng = self.rng
+            self.hold = rng.randint(5, 30)
+            direction = rng.choices((-1, 0, 1), weights=(2, 1, 4))[0]
+            self.frame = InputFrame(
+                left=direction < 0,
+                right=direction > 0,
+                jump=rng.random() < 0.3,
+                attack=rng.random() < 0.3
+            )
+        self.hold -= 1
+        return self.frame
+
+
+class SeekerPolicy:
+    """Идёт к ближайшему врагу или монете, прыжком - к целям выше и через
+    препятствия, бьёт врагов в пределах меча
+
+    Недостижимую за GIVE_UP тиков цель бот на время откладывает и
+    выбирает другую, чтобы не метаться под ней до конца эпизода.
+    """
+
+    ATTACK_RANGE = 70
+    STUCK_TICKS = 10
+    GIVE_UP = 180
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.last_x = None
+        self.stuck = 0
+        self.target = None
+        self.target_ticks = 0
+
+        # Отложенная цель -> тик, до которого она не выбирается
+        self.skipped = {}
+
+    def _choose_target(self, world, center_x, center_y):
+        """Ближайшая не отложенная цель (или случайная, если отложены все)"""
+        targets = world.enemies + world.coins
+        if self.target in targets:
+            self.skipped[self.target] = world.tick + 2 * self.GIVE_UP
+
+        target = None
+        best = None
+        for entity in targets:
+            if self.skipped.get(entity, 0) > world.tick:
+                continue
+            x, y, width, height = entity.bounds()
+            distance = abs(x + width / 2 - center_x) + abs(y + height / 2 - center_y)
+            if best is None or distance < best:
+                best = distance
+                target = entity
+        if target is None and targets:
+            target = self.rng.choice(targets)
+
+        self.target = target
+        self.target_ticks = 0
+
+    def act(self, world):
+        """Ввод на очередной тик"""
+        player = world.player
+        center_x = player.x + PlayerState.WIDTH / 2
+        center_y = player.y + PlayerState.HEIGHT / 2
+
+        is_enemy = self.target in world.enemies
+        if not (is_enemy or self.target in world.coins) or self.target_ticks >= self.GIVE_UP:
+            self._choose_target(world, center_x, center_y)
+            is_enemy = self.target in world.enemies
+        if self.target is None:
+            return InputFrame()
+        self.target_ticks += 1
+
+        x, y, width, height = self.target.bounds()
+        dx = x + width / 2 - center_x
+        dy = y + height / 2 - center_y
+
+        left = dx < -PlayerState.MOVE_SPEED
+        right = dx > PlayerState.MOVE_SPEED
+
+        if player.x == self.last_x and (left or right):
+            self.stuck += 1
+        else:
+            self.stuck = 0
+        self.last_x = player.x
+
+        jump = (
+            dy < -PlayerState.HEIGHT
+            or self.stuck >= self.STUCK_TICKS
+            or self.rng.random() < 0.01
+        )
+
+        # Меч появляется слева только при движении влево
+        attack = False
+        if is_enemy and abs(dx) < self.ATTACK_RANGE and abs(dy) < PlayerState.HEIGHT:
+            attack = True
+            left = dx < 0
+            right = not left
+
+        return InputFrame(left=left, right=right, jump=jump, attack=attack)
+
+
+POLICIES = {
+    "random": RandomPolicy,
+    "seeker": SeekerPolicy,
+}
+
+
+def run_episode(task):
+    """Один эпизод: (уровень, бот, seed, лимит тиков, NumPy) -> словарь результата"""
+    level, policy_name, seed, max_ticks, vectorized = task
+
+    world = World(vectorized=vectorized)
+    world.load_level(level)
+    policy = POLICIES[policy_name](random.Random(seed))
+
+    result = RESULT_TIMEOUT
+    deaths = kills = coins = damage = 0
+    ticks = 0
+    while ticks < max_ticks:
+        events = world.step(policy.act(world))
+        ticks += 1
+        if not events:
+            continue
+
+        for event, entity in events:
+            if event == EVENT_DAMAGE:
+                damage += entity
+            elif event == EVENT_KILL:
+                kills += 1
+            elif event == EVENT_COIN:
+                coins += 1
+            elif event == EVENT_DEATH:
+                deaths += 1
+                if deaths < LIVES:
+                    world.load_level(level)
+                else:
+                    result = RESULT_GAME_OVER
+            elif event == EVENT_LEVEL_COMPLETE:
+                result = RESULT_CLEARED
+
+        if result != RESULT_TIMEOUT:
+            break
+
+    return {
+        "level": level,
+        "policy": policy_name,
+        "seed": seed,
+        "result": result,
+        "ticks": ticks,
+        "deaths": deaths,
+        "score": world.score,
+        "kills": kills,
+        "coins": coins,
+        "damage": damage,
+    }
+
+
+class Summary:
+    """Сводка по эпизодам одного уровня и бота"""
+
+    def __init__(self):
+        self.episodes = 0
+        self.results = {RESULT_CLEARED: 0, RESULT_GAME_OVER: 0, RESULT_TIMEOUT: 0}
+        self.clear_ticks = []
+        self.scores = []
+        self.deaths = {}
+
+    def add(self, record):
+        """Учёт результата эпизода"""
+        self.episodes += 1
+        self.results[record["result"]] += 1
+        if record["result"] == RESULT_CLEARED:
+            self.clear_ticks.append(record["ticks"])
+        self.scores.append(record["score"])
+        self.deaths[record["deaths"]] = self.deaths.get(record["deaths"], 0) + 1
+
+    def lines(self):
+        """Строки отчёта"""
+        percentile = FrameProfiler.percentile
+        rate = self.results[RESULT_CLEARED] / self.episodes if self.episodes else 0.0
+        lines = [
+            f"  эпизодов {self.episodes}: пройдено {rate:.1%}, "
+            f"game over {self.results[RESULT_GAME_OVER]}, "
+            f"не успели {self.results[RESULT_TIMEOUT]}"
+        ]
+        if self.clear_ticks:
+            seconds = [ticks / TICKS_PER_SECOND for ticks in self.clear_ticks]
+            lines.append(
+                f"  время прохождения, с: p10 {percentile(seconds, 10):.1f}  "
+                f"p50 {percentile(seconds, 50):.1f}  p90 {percentile(seconds, 90):.1f}"
+            )
+        lines.append(
+            f"  счёт: p10 {percentile(self.scores, 10)}  p50 {percentile(self.scores, 50)}  "
+            f"p90 {percentile(self.scores, 90)}  max {max(self.scores, default=0)}"
+        )
+        deaths = "  ".join(
+            f"{count}: {self.deaths[count]}" for count in sorted(self.deaths)
+        )
+        lines.append(f"  смертей (сколько: эпизодов): {deaths}")
+        return lines
+
+
+def make_tasks(levels, policies, episodes, seed, max_ticks, vectorized):
+    """Эпизоды в порядке выдачи: уровни и боты вперемешку"""
+    return [
+        (level, policy, seed + index, max_ticks, vectorized)
+        for index in range(episodes)
+        for level in levels
+        for policy in policies
+    ]
+
+
+def main(argv=None):
+    """Массовый прогон ботов по уровням"""
+    parser = argparse.ArgumentParser(description="Оценка сложности уровней ботами")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1],
+                        help="номера уровней")
+    parser.add_argument("--policy", nargs="+", choices=sorted(POLICIES),
+                        default=["seeker"], help="боты")
+    parser.add_argument("--episodes", type=int, default=100,
+                        help="эпизодов на каждую пару уровень/бот")
+    parser.add_argument("--seed", type=int, default=0, help="начальный seed")
+    parser.add_argument("--max-ticks", type=int, default=120 * TICKS_PER_SECOND,
+                        help="лимит тиков на эпизод")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="число процессов (0 - по числу ядер)")
+    parser.add_argument("--out", default="bots.jsonl",
+                        help="файл результатов (JSON Lines)")
+    vectorized = parser.add_mutually_exclusive_group()
+    vectorized.add_argument("--vectorized", dest="vectorized", action="store_true",
+                            default=None, help="всегда использовать NumPy для врагов")
+    vectorized.add_argument("--scalar", dest="vectorized", action="store_false",
+                            help="никогда не использовать NumPy для врагов")
+    args = parser.parse_args(argv)
+
+    tasks = make_tasks(
+        args.levels, args.policy, args.episodes, args.seed, args.max_ticks, args.vectorized
+    )
+    workers = args.workers or os.cpu_count() or 1
+
+    # Пачки по несколько эпизодов: меньше обменов между процессами,
+    # но достаточно мелко, чтобы ядра не простаивали в конце
+    chunksize = max(1, len(tasks) // (workers * 16))
+
+    summaries = {}
+    started = time.perf_counter()
+    with open(args.out, "w", buffering=1, encoding="utf-8") as out_file, \
+            multiprocessing.Pool(workers) as pool:
+        for record in pool.imap_unordered(run_episode, tasks, chunksize):
+            out_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            key = (record["level"], record["policy"])
+            summaries.setdefault(key, Summary()).add(record)
+    elapsed = time.perf_counter() - started
+
+    for level, policy in sorted(summaries):
+        print(f"уровень {level}, бот {policy}")
+        for line in summaries[(level, policy)].lines():
+            print(line)
+
+    rate = len(tasks) / elapsed if elapsed else float("inf")
+    print(
+        f"эпизодов: {len(tasks)}, процессов: {workers}, "
+        f"время: {elapsed:.1f} с, {rate:.1f} эпизодов/с; результаты - {args.out}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+Замер стоимости ИИ врагов за тик: патрулирование и преследование
+
+Для каждого числа врагов создаётся уровень из ярусов платформ, враги
+расставляются по платформам, а игрок бегает и прыгает по сценарию.
+Все враги держатся в активной зоне, время фазы "enemies" снимается
+FrameProfiler по каждому тику. Отдельно печатается время построения
+навигационного графа и его получения из кэша при перезагрузке уровня.
+
+    python -m game.chase_bench --enemies 10 100 500 1000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from game.levels import LevelLibrary
+from game.profiler import FrameProfiler
+from game.world import World, InputFrame, EVENT_DEATH
+
+
+LEVEL_WIDTH = 2400
+LEVEL_HEIGHT = 600
+FLOOR_Y = 550
+TIER_HEIGHT = 80
+PLATFORM_WIDTH = 120
+PLATFORM_GAP = 60
+
+
+def make_level(enemy_count, seed):
+    """Описание уровня: пол, ярусы платформ и враги над платформами"""
+    rng = random.Random(seed)
+    platforms = [[0, FLOOR_Y, LEVEL_WIDTH, 50]]
+    y = FLOOR_Y - TIER_HEIGHT
+    shift = 0
+    while y > 100:
+        for x in range(shift, LEVEL_WIDTH - PLATFORM_WIDTH, PLATFORM_WIDTH + PLATFORM_GAP):
+            platforms.append([x, y, PLATFORM_WIDTH, 20])
+        y -= TIER_HEIGHT
+        shift = (PLATFORM_WIDTH + PLATFORM_GAP) // 2 - shift
+
+    enemies = []
+    for _ in range(enemy_count):
+        x, y, width, _ = rng.choice(platforms)
+        enemies.append([x + rng.uniform(0, max(width - 35, 0)), y - 40])
+
+    return {
+        "width": LEVEL_WIDTH,
+        "height": LEVEL_HEIGHT,
+        "player_start": [LEVEL_WIDTH / 2, FLOOR_Y - 60],
+        "platforms": platforms,
+        "enemies": enemies,
+        "coins": [[10, 10]],
+    }
+
+
+def scripted_input(tick):
+    """Ввод игрока: бег влево-вправо по полторы секунды с прыжками"""
+    right = (tick // 90) % 2 == 0
+    return InputFrame(left=not right, right=right, jump=tick % 45 == 0)
+
+
+def measure(levels, chase, ticks, warmup):
+    """Время фазы врагов по тикам: (p50, p95, max) в мс"""
+    world = World(vectorized=False, levels=levels)
+    world.chase = chase
+
+    # Все враги уровня рядом: без сна и замедления
+    world.lod_active_distance = world.lod_sleep_distance = float("inf")
+    world.load_level(1)
+
+    profiler = FrameProfiler(capacity=ticks)
+    for tick in range(warmup + ticks):
+        if tick == warmup:
+            world.profiler = profiler
+        if world.profiler:
+            profiler.begin_frame()
+        events = world.step(scripted_input(tick))
+        if world.profiler:
+            profiler.end_frame()
+        if any(event == EVENT_DEATH for event, _ in events):
+            world.player.health = world.player.max_health
+
+    p50, p95, _, worst = profiler.stats("enemies")
+    return p50, p95, worst
+
+
+def main(argv=None):
+    """Таблица стоимости ИИ врагов по их числу"""
+    parser = argparse.ArgumentParser(description="Стоимость ИИ врагов за тик")
+    parser.add_argument("--enemies", type=int, nargs="+", default=[10, 100, 500, 1000],
+                        help="числа врагов")
+    parser.add_argument("--ticks", type=int, default=600, help="замеряемых тиков")
+    parser.add_argument("--warmup", type=int, default=120,
+                        help="тиков до замера (враги добегают до игрока)")
+    parser.add_argument("--seed", type=int, default=0, help="seed расстановки врагов")
+    args = parser.parse_args(argv)
+
+    print("врагов   патруль p50/p95/max, мс    преследование p50/p95/max, мс   мкс/враг")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in args.enemies:
+            level_dir = os.path.join(directory, str(count))
+            os.makedirs(level_dir)
+            with open(os.path.join(level_dir, "level_1.json"), "w", encoding="utf-8") as level_file:
+                json.dump(make_level(count, args.seed), level_file)
+            levels = LevelLibrary(level_dir)
+
+            patrol = measure(levels, False, args.ticks, args.warmup)
+            chase = measure(levels, True, args.ticks, args.warmup)
+            per_enemy = chase[0] * 1000 / count if count else 0.0
+            print(
+                f"{count:>6}   {patrol[0]:6.3f} {patrol[1]:6.3f} {patrol[2]:6.3f}"
+                f"        {chase[0]:6.3f} {chase[1]:6.3f} {chase[2]:6.3f}"
+                f"       {per_enemy:6.2f}"
+            )
+
+        # Граф строится при первой загрузке уровня, дальше берётся из кэша
+        world = World(levels=LevelLibrary(level_dir))
+        world.chase = True
+        started = time.perf_counter()
+        world.load_level(1)
+        built = time.perf_counter() - started
+        started = time.perf_counter()
+        world.load_level(1)
+        cached = time.perf_counter() - started
+        navigation = world.navigation
+        print(
+            f"граф: платформ {len(navigation.platforms)}, рёбер {navigation.edge_count()}; "
+            f"загрузка уровня с графом {built * 1000:.1f} мс, из кэша {cached * 1000:.1f} мс"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
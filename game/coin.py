@@ -2,18 +2,23 @@
 Класс монеты
 """
 from PyQt6.QtWidgets import QGraphicsEllipseItem
-from PyQt6.QtGui import QBrush, QColor, QPen
-from PyQt6.QtCore import Qt
+from game import styles
+from game.world import CoinState
 
 
 class Coin(QGraphicsEllipseItem):
-    """Класс монеты для сбора"""
+    """Графический элемент монеты (состояние - в CoinState)"""
 
-    COIN_SIZE = 20
+    COIN_SIZE = CoinState.SIZE
 
-    def __init__(self, x, y):
+    def __init__(self, state):
         super().__init__(0, 0, self.COIN_SIZE, self.COIN_SIZE)
-        self.setBrush(QBrush(QColor(255, 215, 0)))
-        self.setPen(QPen(Qt.GlobalColor.black, 2))
-        self.setPos(x, y)
 
+        self.setBrush(styles.brush("coin"))
+        self.setPen(styles.pen())
+        self.reset(state)
+
+    def reset(self, state):
+        """Привязка элемента к состоянию (в том числе при выдаче из пула)"""
+        self.state = state
+        self.setPos(state.x, state.y)
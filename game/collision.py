@@ -0,0 +1,51 @@
+"""
+Узкая фаза коллизий: AABB и окружность без обращений к Qt
+"""
+
+# Qt включает в контур элемента половину толщины пера (перо 2px),
+# поэтому прямоугольники сталкиваются с запасом в 1px с каждой стороны
+PEN_MARGIN = 1
+
+
+def aabb_overlap(a, b, margin=PEN_MARGIN):
+    """Пересечение прямоугольников a и b в виде (x, y, width, height)"""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    gap = 2 * margin
+    return (ax < bx + bw + gap and bx < ax + aw + gap
+            and ay < by + bh + gap and by < ay + ah + gap)
+
+
+def circle_aabb_overlap(cx, cy, radius, rect, margin=PEN_MARGIN):
+    """Пересечение окружности с центром (cx, cy) и прямоугольника"""
+    x, y, width, height = rect
+    x -= margin
+    y -= margin
+    width += 2 * margin
+    height += 2 * margin
+
+    # Ближайшая к центру точка прямоугольника
+    nearest_x = min(max(cx, x), x + width)
+    nearest_y = min(max(cy, y), y + height)
+    dx = cx - nearest_x
+    dy = cy - nearest_y
+    return dx * dx + dy * dy < radius * radius
+
+
+def swept_vertical_overlap(x, old_y, new_y, width, height, rect, margin=PEN_MARGIN):
+    """Коллизия прямоугольника, сдвинутого по вертикали с old_y на new_y
+
+    Совпадает с обычной проверкой в конечной точке, но дополнительно ловит
+    платформы, через которые прямоугольник проскочил за один тик.
+    """
+    if aabb_overlap((x, new_y, width, height), rect, margin):
+        return True
+
+    # Если в начале движения коллизии не было, а объём движения задевает
+    # прямоугольник, значит он пройден насквозь
+    if aabb_overlap((x, old_y, width, height), rect, margin):
+        return False
+
+    top = min(old_y, new_y)
+    swept_height = abs(new_y - old_y) + height
+    return aabb_overlap((x, top, width, swept_height), rect, margin)
@@ -2,39 +2,45 @@
 Класс врага
 """
 from PyQt6.QtWidgets import QGraphicsRectItem
-from PyQt6.QtGui import QBrush, QColor, QPen
-from PyQt6.QtCore import Qt
+from game import styles
+from game.world import EnemyState
 
 
 class Enemy(QGraphicsRectItem):
-    """Класс врага с AI"""
+    """Графический элемент врага (состояние - в EnemyState)"""
 
-    ENEMY_WIDTH = 35
-    ENEMY_HEIGHT = 35
-    MOVE_SPEED = 2
-    PATROL_DISTANCE = 100
+    ENEMY_WIDTH = EnemyState.WIDTH
+    ENEMY_HEIGHT = EnemyState.HEIGHT
+    MOVE_SPEED = EnemyState.MOVE_SPEED
+    PATROL_DISTANCE = EnemyState.PATROL_DISTANCE
 
-    def __init__(self, x, y, scene):
+    def __init__(self, state):
         super().__init__(0, 0, self.ENEMY_WIDTH, self.ENEMY_HEIGHT)
-        self.game_scene = scene
 
-        self.setBrush(QBrush(QColor(255, 0, 0)))
-        self.setPen(QPen(Qt.GlobalColor.black, 2))
-
-        self.setPos(x, y)
-        self.start_x = x
-        self.direction = 1
-
-    def update(self):
-        """Обновление AI врага"""
-        self.setPos(self.x() + self.MOVE_SPEED * self.direction, self.y())
-
-        if abs(self.x() - self.start_x) > self.PATROL_DISTANCE:
-            self.direction *= -1
-
-        self.setPos(self.x(), self.y() + self.game_scene.GRAVITY)
-
-        for platform in self.game_scene.platforms:
-            if self.collidesWithItem(platform):
-                self.setPos(self.x(), platform.y() - self.ENEMY_HEIGHT)
-                break
+        self.setBrush(styles.brush("enemy"))
+        self.setPen(styles.pen())
+
+        self.reset(state)
+
+    def reset(self, state):
+        """Привязка элемента к состоянию (в том числе при выдаче из пула)"""
+        self.state = state
+
+        # Позиции до и после последнего шага для интерполяции
+        self.prev_x = self.target_x = state.x
+        self.prev_y = self.target_y = state.y
+        self.setPos(state.x, state.y)
+
+    def sync(self):
+        """Перенос позиции из состояния после шага симуляции"""
+        self.prev_x = self.target_x
+        self.prev_y = self.target_y
+        self.target_x = self.state.x
+        self.target_y = self.state.y
+
+    def render(self, alpha):
+        """Позиция между двумя последними шагами (alpha = 0..1)"""
+        self.setPos(
+            self.prev_x + (self.target_x - self.prev_x) * alpha,
+            self.prev_y + (self.target_y - self.prev_y) * alpha
+        )
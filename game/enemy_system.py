@@ -0,0 +1,146 @@
+"""
+Векторизованное патрулирование врагов на NumPy
+"""
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from game.collision import PEN_MARGIN
+
+
+class EnemySystem:
+    """Состояние всех врагов уровня в массивах и шаг патрулирования для всех сразу
+
+    Массивы - рабочая копия: после шага координаты и направление изменившихся
+    врагов записываются обратно в их EnemyState.
+    """
+
+    # С меньшим числом врагов накладные расходы NumPy больше выигрыша
+    VECTORIZE_THRESHOLD = 32
+
+    def __init__(self):
+        self.enemies = []
+
+        self.x = None
+        self.y = None
+        self.start_x = None
+        self.direction = None
+        self.alive = None
+        self.slot = None
+
+        self.width = 0
+        self.height = 0
+
+        # Границы платформ с учётом запаса на перо
+        self.platform_left = None
+        self.platform_right = None
+        self.platform_top = None
+        self.platform_bottom = None
+        self.platform_snap_y = None
+
+    @staticmethod
+    def available():
+        """Установлен ли NumPy"""
+        return np is not None
+
+    def build(self, enemies, platforms, enemy_width, enemy_height):
+        """Заполнение массивов из состояний врагов и платформ уровня"""
+        self.enemies = list(enemies)
+        for index, enemy in enumerate(self.enemies):
+            enemy.index = index
+
+        self.width = enemy_width
+        self.height = enemy_height
+
+        self.x = np.array([enemy.x for enemy in self.enemies], dtype=np.float64)
+        self.y = np.array([enemy.y for enemy in self.enemies], dtype=np.float64)
+        self.start_x = np.array([enemy.start_x for enemy in self.enemies], dtype=np.float64)
+        self.direction = np.array([enemy.direction for enemy in self.enemies], dtype=np.float64)
+        self.alive = np.array([enemy.alive for enemy in self.enemies], dtype=bool)
+        self.slot = np.array([enemy.slot for enemy in self.enemies], dtype=np.int64)
+
+        gap = 2 * PEN_MARGIN
+        left = np.array([platform.x for platform in platforms], dtype=np.float64)
+        top = np.array([platform.y for platform in platforms], dtype=np.float64)
+        width = np.array([platform.width for platform in platforms], dtype=np.float64)
+        height = np.array([platform.height for platform in platforms], dtype=np.float64)
+
+        # Условие пересечения из aabb_overlap, разнесённое на границы
+        self.platform_left = left - enemy_width - gap
+        self.platform_right = left + width + gap
+        self.platform_top = top - enemy_height - gap
+        self.platform_bottom = top + height + gap
+        self.platform_snap_y = top - enemy_height
+
+    def remove(self, enemy):
+        """Исключение убитого врага"""
+        self.alive[enemy.index] = False
+
+    def activity(self, player_x, tick, active_distance, sleep_distance, interval):
+        """Число тиков шага каждого врага (0 - не обновляется) и счётчики
+
+        Правила те же, что у World._enemy_ticks. Возвращает
+        (массив тиков, активных, замедленных).
+        """
+        distance = np.abs(self.x - player_x)
+        active = self.alive & (distance <= active_distance)
+        throttled = self.alive & ~active & (distance <= sleep_distance)
+
+        ticks = active.astype(np.float64)
+        ticks[throttled & ((tick + self.slot) % interval == 0)] = interval
+        return ticks, int(active.sum()), int(throttled.sum())
+
+    def step(self, speed, patrol_distance, gravity, ticks):
+        """Шаг патрулирования врагов на ticks тиков каждого
+
+        Возвращает сдвинувшихся врагов.
+        """
+        if not self.enemies:
+            return []
+
+        old_x = self.x.copy()
+        old_y = self.y.copy()
+
+        x = self.x
+        y = self.y
+        direction = self.direction
+
+        updated = ticks > 0
+        x += speed * direction * ticks
+
+        turned = updated & (np.abs(x - self.start_x) > patrol_distance)
+        direction[turned] *= -1
+
+        y += gravity * ticks
+
+        # Пересечение каждого врага с каждой платформой (E x P)
+        column_x = x[:, None]
+        column_y = y[:, None]
+        overlap = (
+            (column_x < self.platform_right) & (self.platform_left < column_x)
+            & (column_y < self.platform_bottom) & (self.platform_top < column_y)
+        )
+
+        # Как и в последовательной версии, берётся первая платформа по списку
+        if overlap.shape[1]:
+            first = overlap.argmax(axis=1)
+            landed = overlap[np.arange(len(first)), first] & updated
+            np.copyto(y, self.platform_snap_y[first], where=landed)
+
+        changed = np.flatnonzero(self.alive & ((x != old_x) | (y != old_y)))
+        if not len(changed):
+            return []
+
+        # Обратная запись только изменившихся врагов
+        moved = []
+        enemies = self.enemies
+        for index, new_x, new_y, new_direction in zip(
+                changed.tolist(), x[changed].tolist(),
+                y[changed].tolist(), direction[changed].tolist()):
+            enemy = enemies[index]
+            enemy.x = new_x
+            enemy.y = new_y
+            enemy.direction = int(new_direction)
+            moved.append(enemy)
+        return moved
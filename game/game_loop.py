@@ -0,0 +1,68 @@
+"""
+Игровой цикл с фиксированным шагом симуляции
+"""
+import time
+
+
+class FixedStepLoop:
+    """Аккумулятор реального времени для фиксированного шага симуляции
+
+    Таймер окна может срабатывать неравномерно: advance() по монотонным
+    часам считает, сколько шагов симуляции нужно выполнить, а alpha
+    показывает долю следующего шага для интерполяции отрисовки.
+    """
+
+    STEP = 1 / 60
+
+    # Больше шагов за кадр не догоняем: после долгой задержки
+    # лишнее время отбрасывается, а не прокручивается разом
+    MAX_CATCH_UP_STEPS = 5
+
+    def __init__(self, step=STEP, max_catch_up_steps=MAX_CATCH_UP_STEPS,
+                 clock=time.perf_counter):
+        self.step = step
+        self.max_catch_up_steps = max_catch_up_steps
+        self.clock = clock
+
+        self.accumulator = 0.0
+        self.last_time = None
+
+        # Последнее измеренное время кадра (секунды)
+        self.frame_time = 0.0
+
+        # Время, отброшенное из-за ограничения догоняющих шагов
+        self.dropped_time = 0.0
+
+    def reset(self):
+        """Сброс часов (после паузы время не накапливается)"""
+        self.accumulator = 0.0
+        self.last_time = None
+        self.frame_time = 0.0
+
+    def advance(self):
+        """Количество шагов симуляции, которые нужно выполнить сейчас"""
+        now = self.clock()
+        if self.last_time is None:
+            self.last_time = now
+            return 0
+
+        self.frame_time = now - self.last_time
+        self.last_time = now
+        self.accumulator += self.frame_time
+
+        steps = int(self.accumulator // self.step)
+        if steps > self.max_catch_up_steps:
+            steps = self.max_catch_up_steps
+            excess = self.accumulator - steps * self.step
+            # Остаток меньше шага сохраняется, остальное отбрасывается
+            kept = excess % self.step
+            self.dropped_time += excess - kept
+            self.accumulator = steps * self.step + kept
+
+        self.accumulator -= steps * self.step
+        return steps
+
+    @property
+    def alpha(self):
+        """Доля следующего шага для интерполяции (0..1)"""
+        return self.accumulator / self.step
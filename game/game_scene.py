@@ -1,186 +1,555 @@
 """
 Игровая сцена
 """
-from PyQt6.QtWidgets import QGraphicsScene, QMessageBox
+import atexit
+import time
+
+from PyQt6.QtWidgets import QGraphicsScene, QGraphicsSimpleTextItem
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QBrush, QColor
+from PyQt6.QtGui import QFont
 from game.player import Player
 from game.platform import Platform
 from game.enemy import Enemy
 from game.coin import Coin
 from game.sword import Sword
-from database.db_manager import DatabaseManager
+from game.replay import InputRecorder
+from game.item_pool import ItemPool
+from game.static_layer import StaticLayer
+from game.batch_items import RectBatch, SpriteBatch
+from game.overlay import MessageOverlay
+from game.simulation_thread import SimulationThread
+from game import styles
+from game import settings
+from game.world import (
+    World, InputFrame, EVENT_ATTACK, EVENT_SWORD_END, EVENT_KILL,
+    EVENT_COIN, EVENT_DEATH, EVENT_LEVEL_COMPLETE
+)
 
 
 class GameScene(QGraphicsScene):
-    """Класс игровой сцены"""
+    """Класс игровой сцены: отображение состояния World"""
+
+    SCENE_WIDTH = World.WIDTH
+    SCENE_HEIGHT = World.HEIGHT
+    GRAVITY = World.GRAVITY
 
-    SCENE_WIDTH = 800
-    SCENE_HEIGHT = 600
-    GRAVITY = 0.5
+    # Панель профилировщика обновляется раз в столько кадров
+    OVERLAY_REFRESH_FRAMES = 30
 
     def __init__(self, game_window):
         super().__init__(0, 0, self.SCENE_WIDTH, self.SCENE_HEIGHT)
         self.game_window = game_window
-        self.setBackgroundBrush(QBrush(QColor(135, 206, 235)))
-
-        self.platforms = []
-        self.enemies = []
-        self.coins = []
-        self.swords = []
-
-        self.player = Player(self)
+        self.setBackgroundBrush(styles.brush("sky"))
+
+        # Вся игровая логика - в модели мира, сцена только отображает её
+        self.world = World()
+
+        # Небо и платформы - готовые картинки вместо элементов
+        # (PLATFORMER_STATIC_LAYER=0 - прежняя отрисовка для сравнения)
+        self.static_layer = None
+        if settings.STATIC_LAYER:
+            self.static_layer = StaticLayer(self.world)
+
+            # Почти все элементы сцены движутся каждый кадр: поддерживать
+            # для них BSP-индекс дороже, чем перебирать их при отрисовке
+            self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+
+        # Графические элементы по сущностям мира (только активных чанков)
+        self.platforms = {}
+        self.enemies = {}
+        self.coins = {}
+        self.swords = {}
+
+        # Враги, которые двигались на последнем шаге (интерполируются)
+        self.moving_enemies = set()
+
+        # Пулы элементов: при смене уровня и атаках элементы
+        # прячутся и переиспользуются, а не удаляются из сцены
+        self.pools = {
+            "platforms": ItemPool(self, Platform),
+            "enemies": ItemPool(self, Enemy),
+            "coins": ItemPool(self, Coin),
+            "swords": ItemPool(self, Sword),
+        }
+
+        self.player = Player(self.world.player)
         self.addItem(self.player)
 
+        # Пакетные элементы (PLATFORMER_BATCH): все монеты и, если нет
+        # статического слоя, все платформы активных чанков - по одному элементу
+        self.coin_batch = None
+        self.platform_batch = None
+        if settings.BATCH_ITEMS:
+            self.coin_batch = SpriteBatch("coin", Coin.COIN_SIZE)
+            self.addItem(self.coin_batch)
+            if self.static_layer is None:
+                self.platform_batch = RectBatch("platform")
+                self.addItem(self.platform_batch)
+
+        # Сообщения о паузе, смерти и прохождении уровня
+        self.overlay = MessageOverlay()
+        self.addItem(self.overlay)
+
         self.current_level = 1
 
         # Создаём keys_pressed ПЕРЕД load_level()
         self.keys_pressed = set()
-        self.attack_cooldown = 0
-        self.ATTACK_COOLDOWN_TIME = 20
+
+        # Прыжок и атака применяются в начале следующего тика
+        self.jump_requested = False
+        self.attack_requested = False
 
         # Имя игрока (устанавливается из game_window)
         self.current_player = "Игрок1"
 
-        self.db = DatabaseManager()
+        # Общее с окном соединение с очередью статистики
+        self.db = game_window.db
+
+        # Профилировщик кадра и его экранная панель (по умолчанию выключены)
+        self.profiler = None
+        self.profiler_overlay = None
+
+        # Тики в отдельном потоке (PLATFORMER_SIM_THREAD): World принадлежит
+        # потоку симуляции, а сцена отображает его снимки
+        self.simulation = None
+        self.snapshot = None
+        self.simulation_step = game_window.SIMULATION_STEP
+        if settings.SIMULATION_THREAD:
+            self.simulation = SimulationThread(
+                self.world, game_window.SIMULATION_STEP, game_window.FRAME_TIME
+            )
 
         # load_level() вызывается ПОСЛЕ keys_pressed
         self.load_level(1)
 
+        # Запись ввода (PLATFORMER_RECORD) начинается с исходного состояния мира
+        self.recorder = None
+        if settings.RECORD_PATH:
+            self.recorder = InputRecorder(self.world.level)
+            if self.simulation:
+                self.simulation.set_recorder(self.recorder)
+            atexit.register(self.save_recording)
+
+    def reset(self):
+        """Подготовка сцены к новой игре: первый уровень и новая запись
+
+        Окно и сцена переиспользуются между играми, поэтому элементы
+        прошлой игры возвращаются в пулы, а не создаются заново. Счётчики
+        мира (тик, счёт, перезарядка атаки) сбрасываются до загрузки уровня.
+        """
+        if self.simulation:
+            self.simulation.call(self.world.reset)
+        else:
+            self.world.reset()
+        self.load_level(1)
+        if self.recorder:
+            self.recorder = InputRecorder(self.world.level)
+            if self.simulation:
+                self.simulation.set_recorder(self.recorder)
+
+    def dispose(self):
+        """Освобождение сцены вместе с окном: поток симуляции, элементы и запись ввода"""
+        if self.simulation:
+            self.simulation.stop()
+            self.simulation = None
+            self.snapshot = None
+
+        if self.recorder:
+            atexit.unregister(self.save_recording)
+            self.recorder = None
+
+        # Ссылки на элементы убираются до удаления их самих сценой
+        for pool in self.pools.values():
+            pool.free.clear()
+        self.platforms.clear()
+        self.enemies.clear()
+        self.coins.clear()
+        self.swords.clear()
+        self.moving_enemies.clear()
+        self.player = None
+        self.overlay = None
+        self.coin_batch = None
+        self.platform_batch = None
+        self.profiler_overlay = None
+        self.clear()
+
     def load_level(self, level_number):
         """Загрузка уровня"""
         self.current_level = level_number
 
         # Очищаем нажатые клавиши при загрузке уровня
         self.keys_pressed.clear()
-
-        # Очищаем сцену
-        for platform in self.platforms:
-            self.removeItem(platform)
-        for enemy in self.enemies:
-            self.removeItem(enemy)
-        for coin in self.coins:
-            self.removeItem(coin)
-        for sword in self.swords:
-            self.removeItem(sword)
+        self.jump_requested = False
+        self.attack_requested = False
+
+        # Возвращаем элементы в пулы
+        for platform in self.platforms.values():
+            self.pools["platforms"].release(platform)
+        for enemy in self.enemies.values():
+            self.pools["enemies"].release(enemy)
+        for coin in self.coins.values():
+            self.pools["coins"].release(coin)
+        for sword in self.swords.values():
+            self.pools["swords"].release(sword)
 
         self.platforms.clear()
         self.enemies.clear()
         self.coins.clear()
         self.swords.clear()
-
-        # Сбрасываем игрока
-        self.player.setPos(50, 400)
-        self.player.velocity_y = 0
-        self.player.health = 100
-        self.player.update_color()
+        self.moving_enemies.clear()
+
+        if self.simulation:
+            # Уровень загружается в потоке симуляции между тиками
+            snapshot = self.simulation.load_level(level_number)
+            self.setSceneRect(0, 0, snapshot.width, snapshot.height)
+            if self.static_layer:
+                self.static_layer.clear()
+            self.apply_snapshot(snapshot)
+            return
 
         # Создаём уровень
-        ground = Platform(0, 550, 800, 50)
-        self.platforms.append(ground)
-        self.addItem(ground)
-
-        platform_data = [
-            (150, 450, 120, 20), (320, 380, 120, 20), (500, 310, 120, 20),
-            (650, 240, 120, 20), (200, 250, 100, 20), (400, 180, 150, 20),
-        ]
-
-        for x, y, width, height in platform_data:
-            platform = Platform(x, y, width, height)
-            self.platforms.append(platform)
-            self.addItem(platform)
-
-        enemy_positions = [(300, 330), (550, 260), (450, 130)]
-        for x, y in enemy_positions:
-            enemy = Enemy(x, y, self)
-            self.enemies.append(enemy)
-            self.addItem(enemy)
-
-        coin_positions = [
-            (180, 400), (350, 330), (530, 260),
-            (680, 190), (230, 200), (430, 130)
-        ]
-        for x, y in coin_positions:
-            coin = Coin(x, y)
-            self.coins.append(coin)
-            self.addItem(coin)
+        self.world.load_level(level_number)
+        self.setSceneRect(0, 0, self.world.width, self.world.height)
+        if self.static_layer:
+            self.static_layer.clear()
+
+        self.stream_items()
+        self.player.snap()
+
+    def stream_items(self):
+        """Элементы только для сущностей активных чанков мира
+
+        Сущности, ушедшие из активных чанков, возвращают элементы в пулы,
+        а вошедшие получают их из пулов - число элементов сцены ограничено
+        окрестностью игрока, а не размером уровня.
+        """
+        if self.static_layer:
+            self.setBackgroundBrush(self.static_layer.brush())
+        elif self.platform_batch:
+            self.platform_batch.set_instances(self.world.active_platforms)
+        else:
+            self._stream(self.platforms, self.world.active_platforms, self.pools["platforms"])
+
+        self._stream(self.enemies, self.world.active_enemies, self.pools["enemies"])
+
+        if self.coin_batch:
+            self.coin_batch.set_instances(self.world.active_coins())
+        else:
+            self._stream(self.coins, self.world.active_coins(), self.pools["coins"])
+
+    def _stream(self, items, states, pool):
+        """Приведение словаря элементов к набору состояний"""
+        wanted = set(states)
+        for state in [state for state in items if state not in wanted]:
+            item = items.pop(state)
+            self.moving_enemies.discard(item)
+            pool.release(item)
+        for state in states:
+            if state not in items:
+                items[state] = pool.acquire(state)
+
+    def pool_stats(self):
+        """Счётчики пулов: {имя: (выдано из пула, создано, свободно)}"""
+        return {name: pool.stats() for name, pool in self.pools.items()}
+
+    def set_profiler(self, profiler, overlay=False):
+        """Подключение профилировщика кадра"""
+        self.profiler = profiler
+
+        # В потоке симуляции фазы тика не замеряются: профилировщик
+        # принадлежит потоку окна
+        if self.simulation is None:
+            self.world.profiler = profiler
+
+        if overlay and self.profiler_overlay is None:
+            self.profiler_overlay = QGraphicsSimpleTextItem()
+            self.profiler_overlay.setFont(QFont("Monospace", 9))
+            self.profiler_overlay.setZValue(1000)
+            self.profiler_overlay.setPos(5, 5)
+            self.addItem(self.profiler_overlay)
+
+    def show_overlay(self, title, text):
+        """Сообщение поверх сцены в центре видимой области"""
+        center = self.sceneRect().center()
+        for view in self.views():
+            center = view.mapToScene(view.viewport().rect().center())
+        self.overlay.show_message(title, text, center)
+
+    def hide_overlay(self):
+        """Скрытие сообщения"""
+        self.overlay.hide()
 
     def restart_level(self):
-        """Перезапуск текущего уровня при смерти"""
-        QMessageBox.warning(
-            None,
-            "Смерть!",
-            f"Здоровье = 0\nУровень {self.current_level} начинается заново"
-        )
-
-        # Добавляем смерть в статистику
-        self.db.add_death(self.current_player)
+        """Перезапуск текущего уровня после смерти
 
-        self.game_window.lose_life()
+        Вызывается окном после сообщения о смерти, уже вне тика. Уровень
+        перезагружается до потери жизни: при Game Over запись ввода
+        сохраняется с новым исходным состоянием уровня.
+        """
         self.load_level(self.current_level)
+        self.game_window.lose_life()
 
     def update_scene(self):
         """Обновление игровой логики"""
-        if self.attack_cooldown > 0:
-            self.attack_cooldown -= 1
-
-        # Сначала обновляем физику (гравитацию)
-        self.player.update()
-
-        # Затем обрабатываем управление
-        if Qt.Key.Key_A in self.keys_pressed:
-            self.player.move_left()
-        if Qt.Key.Key_D in self.keys_pressed:
-            self.player.move_right()
-
-        for enemy in self.enemies[:]:
-            enemy.update()
-            if self.player.collidesWithItem(enemy):
-                self.player.take_damage(10)
-                if self.player.x() < enemy.x():
-                    self.player.setPos(self.player.x() - 30, self.player.y())
+        inputs = InputFrame(
+            left=Qt.Key.Key_A in self.keys_pressed,
+            right=Qt.Key.Key_D in self.keys_pressed,
+            jump=self.jump_requested,
+            attack=self.attack_requested
+        )
+        self.jump_requested = False
+        self.attack_requested = False
+
+        if self.recorder:
+            self.recorder.record(inputs)
+
+        events = self.world.step(inputs)
+
+        # Появление и удаление элементов
+        for event, entity in events:
+            if event == EVENT_ATTACK:
+                self.swords[entity] = self.pools["swords"].acquire(entity)
+            elif event == EVENT_SWORD_END:
+                self.pools["swords"].release(self.swords.pop(entity))
+            elif event == EVENT_KILL:
+                self.pools["enemies"].release(self.enemies.pop(entity))
+                self.game_window.add_score(50)
+
+                # Добавляем убийство в статистику
+                self.game_window.add_enemy_killed()
+            elif event == EVENT_COIN:
+                if self.coin_batch:
+                    self.coin_batch.hide_instance(entity)
                 else:
-                    self.player.setPos(self.player.x() + 30, self.player.y())
-
-        for sword in self.swords[:]:
-            if not sword.update():
-                self.removeItem(sword)
-                self.swords.remove(sword)
-                continue
-
-            for enemy in self.enemies[:]:
-                if sword.collidesWithItem(enemy):
-                    self.removeItem(enemy)
-                    self.enemies.remove(enemy)
-                    self.game_window.add_score(50)
-
-                    # Добавляем убийство в статистику
-                    self.game_window.add_enemy_killed()
-
-                    break
-
-        for coin in self.coins[:]:
-            if self.player.collidesWithItem(coin):
-                self.removeItem(coin)
-                self.coins.remove(coin)
+                    self.pools["coins"].release(self.coins.pop(entity))
                 self.game_window.add_score(10)
 
                 # Добавляем монету в статистику
                 self.game_window.add_coin_collected()
 
-        if len(self.coins) == 0 and len(self.enemies) == 0:
-            self.game_window.level_complete()
+        # Игрок перешёл в другой чанк - подгружаем и выгружаем элементы
+        if self.world.chunks_changed:
+            self.stream_items()
+        elif self.world.active_enemies_changed:
+            # Враг ушёл из активной части мира без смены чанков
+            self._stream(self.enemies, self.world.active_enemies, self.pools["enemies"])
+
+        self.sync_items()
+
+        if self.profiler:
+            self.profiler.count_step()
+            self.profiler.mark("scene")
+
+        # Смерть и прохождение уровня только меняют состояние игры:
+        # перезапуск и смена уровня выполняются после сообщения, вне тика
+        for event, entity in events:
+            if event == EVENT_DEATH:
+                self.game_window.player_died()
+            elif event == EVENT_LEVEL_COMPLETE:
+                self.game_window.level_complete()
+
+    def set_running(self, running):
+        """Пуск и остановка тиков потока симуляции (без потока - ничего)"""
+        if self.simulation:
+            self.simulation.set_running(running)
+
+    def update_from_simulation(self):
+        """Кадр при симуляции в потоке: события тиков и последний снимок
+
+        События забираются до снимка: поток добавляет их раньше, чем
+        публикует снимок, поэтому снимок не старше событий.
+        """
+        events = self.simulation.take_events()
+        for event in events:
+            if event == EVENT_KILL:
+                self.game_window.add_score(50)
+                self.game_window.add_enemy_killed()
+            elif event == EVENT_COIN:
+                self.game_window.add_score(10)
+                self.game_window.add_coin_collected()
+
+        snapshot = self.simulation.latest()
+        if snapshot is not self.snapshot:
+            self.apply_snapshot(snapshot)
+
+        if self.profiler:
+            self.profiler.mark("scene")
+
+        # Доля шага, прошедшая с публикации снимка
+        alpha = (time.perf_counter() - snapshot.time) / self.simulation_step
+        self.render(min(alpha, 1.0))
+
+        for event in events:
+            if event == EVENT_DEATH:
+                self.game_window.player_died()
+            elif event == EVENT_LEVEL_COMPLETE:
+                self.game_window.level_complete()
+
+    def apply_snapshot(self, snapshot):
+        """Перенос снимка потока симуляции в графические элементы
+
+        Враги сопоставляются элементам по номеру на уровне, а платформы,
+        монеты и мечи - по своим неизменным состояниям. Наборы платформ и
+        монет пересобираются, только когда поток выдал новые кортежи.
+        """
+        previous = self.snapshot
+        self.snapshot = snapshot
+        new_level = previous is None or previous.generation != snapshot.generation
+
+        if new_level or snapshot.active_platforms is not previous.active_platforms:
+            if self.static_layer:
+                self.static_layer.world = snapshot
+                self.setBackgroundBrush(self.static_layer.brush())
+            elif self.platform_batch:
+                self.platform_batch.set_instances(snapshot.active_platforms)
+            else:
+                self._stream(self.platforms, snapshot.active_platforms, self.pools["platforms"])
+
+        if new_level or snapshot.coins is not previous.coins:
+            if self.coin_batch:
+                self.coin_batch.set_instances(snapshot.coins)
+            else:
+                self._stream(self.coins, snapshot.coins, self.pools["coins"])
+
+        self._stream(self.swords, snapshot.swords, self.pools["swords"])
+        self._apply_enemies(snapshot.enemies)
+
+        self.player.state = snapshot.player
+        if new_level:
+            self.player.snap()
+        else:
+            self.player.sync()
+
+    def _apply_enemies(self, views):
+        """Элементы врагов по снимку: появление, удаление и сдвиг"""
+        wanted = {view.slot: view for view in views}
+        for slot in [slot for slot in self.enemies if slot not in wanted]:
+            enemy = self.enemies.pop(slot)
+            self.moving_enemies.discard(enemy)
+            self.pools["enemies"].release(enemy)
+
+        moving = set()
+        for view in views:
+            enemy = self.enemies.get(view.slot)
+            if enemy is None:
+                self.enemies[view.slot] = self.pools["enemies"].acquire(view)
+            elif view.x != enemy.target_x or view.y != enemy.target_y:
+                enemy.state = view
+                enemy.sync()
+                moving.add(enemy)
+
+        # Остановившиеся враги дорисовываются в конечную позицию
+        for enemy in self.moving_enemies - moving:
+            enemy.sync()
+            enemy.render(1.0)
+
+        self.moving_enemies = moving
+
+    def sync_items(self):
+        """Перенос позиций движущихся сущностей в графические элементы"""
+        self.player.sync()
+
+        # Только враги, которые сдвинулись за тик
+        moving = set()
+        for state in self.world.moved_enemies:
+            enemy = self.enemies.get(state)
+            if enemy:
+                enemy.sync()
+                moving.add(enemy)
+
+        # Остановившиеся враги дорисовываются в конечную позицию
+        for enemy in self.moving_enemies - moving:
+            if enemy.state.alive:
+                enemy.sync()
+                enemy.render(1.0)
+
+        self.moving_enemies = moving
+
+    def render(self, alpha):
+        """Расстановка элементов между двумя последними шагами симуляции"""
+        self.player.render(alpha)
+        for enemy in self.moving_enemies:
+            enemy.render(alpha)
+
+        # Камера следует за игроком (на уровне в один экран стоит на месте)
+        for view in self.views():
+            view.centerOn(self.player)
+
+        if self.profiler:
+            if (self.profiler_overlay
+                    and self.profiler.frame_number % self.OVERLAY_REFRESH_FRAMES == 0):
+                self.update_profiler_overlay()
+            self.profiler.mark("render")
+
+    def update_profiler_overlay(self):
+        """Обновление текста панели профилировщика"""
+        for view in self.views():
+            self.profiler_overlay.setPos(view.mapToScene(5, 5))
+
+        # При симуляции в потоке значения мира берутся из снимка
+        source = self.snapshot or self.world
+
+        p50, p95, p99, worst = self.profiler.stats()
+        active, throttled, sleeping = source.lod_counts
+        repaint = self.profiler.stats("repaint")[1]
+        pools = "  ".join(
+            f"{name} {hits}/{misses}" for name, (hits, misses, free) in self.pool_stats().items()
+        )
+        self.profiler_overlay.setText(
+            f"кадр p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f}  max {worst:.2f} мс\n"
+            f"перерисовка p95 {repaint:.2f} мс  пары {source.candidate_pairs}\n"
+            f"пулы (из пула/создано): {pools}\n"
+            f"чанки {source.active_chunks[0]}..{source.active_chunks[1]}  "
+            f"элементов {len(self.platforms) + len(self.enemies) + len(self.coins)}\n"
+            f"враги: активных {active}, замедленных {throttled}, спящих {sleeping}"
+        )
+
+    def drawBackground(self, painter, rect):
+        """Отрисовка фона (начало перерисовки кадра)"""
+        if self.profiler:
+            self.profiler.begin_paint()
+
+        # Фоновая кисть статического слоя покрывает только активную часть мира
+        if self.static_layer is None or self.static_layer.rect().contains(rect):
+            super().drawBackground(painter, rect)
+        else:
+            self.static_layer.draw_partial(painter, rect, self.backgroundBrush())
+
+    def drawForeground(self, painter, rect):
+        """Отрисовка переднего плана (конец перерисовки кадра)"""
+        super().drawForeground(painter, rect)
+        if self.profiler:
+            self.profiler.end_paint()
+
+    def save_recording(self):
+        """Сохранение записи ввода в файл PLATFORMER_RECORD"""
+        if self.recorder:
+            if self.simulation:
+                self.simulation.call(self.recorder.save, settings.RECORD_PATH, self.world)
+            else:
+                self.recorder.save(settings.RECORD_PATH, self.world)
 
     def handle_key_press(self, event):
         """Обработка нажатия клавиш"""
+        if self.simulation:
+            # Ввод уходит в очередь потока симуляции без ожидания
+            self.simulation.send_press(event.key())
+            if event.key() == Qt.Key.Key_Space:
+                self.simulation.send_jump()
+            return
+
         self.keys_pressed.add(event.key())
 
         if event.key() == Qt.Key.Key_Space:
-            self.player.jump()
+            self.jump_requested = True
 
     def handle_key_release(self, event):
         """Обработка отпускания клавиш"""
         key = event.key()
+        if self.simulation:
+            self.simulation.send_release(key)
+            return
+
         self.keys_pressed.discard(key)
 
         # Персонаж останавливается автоматически
@@ -191,15 +560,8 @@ class GameScene(QGraphicsScene):
             self.sword_attack()
 
     def sword_attack(self):
-        """Выполнение атаки мечом"""
-        if self.attack_cooldown > 0:
-            return
-
-        direction_right = not (Qt.Key.Key_A in self.keys_pressed)
-
-        sword = Sword(self.player.x(), self.player.y(), direction_right)
-        self.swords.append(sword)
-        self.addItem(sword)
-
-        self.attack_cooldown = self.ATTACK_COOLDOWN_TIME
-        self.player.attack_animation()
+        """Запрос атаки мечом (выполняется в следующем тике)"""
+        if self.simulation:
+            self.simulation.send_attack()
+        else:
+            self.attack_requested = True
@@ -0,0 +1,42 @@
+"""
+Пул графических элементов сцены
+"""
+
+
+class ItemPool:
+    """Переиспользуемые элементы одного типа: вместо удаления они прячутся
+
+    Элемент добавляется в сцену один раз при создании, а при повторной
+    выдаче получает новое состояние через reset(state) и показывается.
+    """
+
+    def __init__(self, scene, factory):
+        self.scene = scene
+        self.factory = factory
+        self.free = []
+
+        # Выдачи из пула и создания новых элементов
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, state):
+        """Элемент для состояния сущности"""
+        if self.free:
+            item = self.free.pop()
+            item.reset(state)
+            item.show()
+            self.hits += 1
+        else:
+            item = self.factory(state)
+            self.scene.addItem(item)
+            self.misses += 1
+        return item
+
+    def release(self, item):
+        """Возврат элемента в пул"""
+        item.hide()
+        self.free.append(item)
+
+    def stats(self):
+        """Счётчики пула: (выдано из пула, создано, свободно)"""
+        return self.hits, self.misses, len(self.free)
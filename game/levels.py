@@ -0,0 +1,185 @@
+"""
+Уровни: исходники в JSON и скомпилированный бинарный кэш
+
+Исходник levels/level_<номер>.json компилируется в levels/compiled/
+level_<номер>.lvl - заголовок и упакованные массивы double, которые
+читаются через mmap без разбора. Кэш пересобирается, только когда у
+исходника меняется время изменения или размер.
+"""
+import json
+import mmap
+import os
+import re
+import struct
+
+
+LEVELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "levels")
+CACHE_DIR_NAME = "compiled"
+
+MAGIC = b"PLVL"
+VERSION = 1
+
+# magic, версия, mtime_ns и размер исходника, ширина, высота, старт игрока,
+# количество платформ, врагов и монет
+HEADER = struct.Struct("<4sHxxqqddddIIIxxxx")
+
+PLATFORM = struct.Struct("<dddd")
+POINT = struct.Struct("<dd")
+
+LEVEL_FILE_PATTERN = re.compile(r"^level_(\d+)\.json$")
+
+
+class LevelError(Exception):
+    """Ошибка в описании уровня"""
+
+
+class CompiledLevel:
+    """Уровень, отображённый в память из скомпилированного файла"""
+
+    def __init__(self, number, data, source_stamp):
+        self.number = number
+        self.source_stamp = source_stamp
+        self._data = data
+
+        (magic, version, mtime_ns, size, width, height, start_x, start_y,
+         platform_count, enemy_count, coin_count) = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise LevelError(f"уровень {number}: неверный формат кэша")
+
+        self.width = width
+        self.height = height
+        self.player_start = (start_x, start_y)
+
+        view = memoryview(data)
+        offset = HEADER.size
+        self._platforms = view[offset:offset + platform_count * PLATFORM.size]
+        offset += platform_count * PLATFORM.size
+        self._enemies = view[offset:offset + enemy_count * POINT.size]
+        offset += enemy_count * POINT.size
+        self._coins = view[offset:offset + coin_count * POINT.size]
+
+    @property
+    def platforms(self):
+        """Платформы (x, y, width, height)"""
+        return PLATFORM.iter_unpack(self._platforms)
+
+    @property
+    def enemies(self):
+        """Стартовые позиции врагов (x, y)"""
+        return POINT.iter_unpack(self._enemies)
+
+    @property
+    def coins(self):
+        """Позиции монет (x, y)"""
+        return POINT.iter_unpack(self._coins)
+
+
+def compile_level(source, stamp):
+    """Бинарное представление уровня из разобранного JSON"""
+    try:
+        width = source["width"]
+        height = source["height"]
+        start_x, start_y = source["player_start"]
+        platforms = [tuple(platform) for platform in source["platforms"]]
+        enemies = [tuple(enemy) for enemy in source.get("enemies", [])]
+        coins = [tuple(coin) for coin in source.get("coins", [])]
+    except (KeyError, TypeError, ValueError) as error:
+        raise LevelError(f"неверное описание уровня: {error}") from error
+
+    parts = [HEADER.pack(
+        MAGIC, VERSION, stamp[0], stamp[1], width, height, start_x, start_y,
+        len(platforms), len(enemies), len(coins)
+    )]
+    try:
+        parts.extend(PLATFORM.pack(*platform) for platform in platforms)
+        parts.extend(POINT.pack(*enemy) for enemy in enemies)
+        parts.extend(POINT.pack(*coin) for coin in coins)
+    except struct.error as error:
+        raise LevelError(f"неверное описание уровня: {error}") from error
+    return b"".join(parts)
+
+
+class LevelLibrary:
+    """Набор уровней каталога с кэшем скомпилированных файлов"""
+
+    def __init__(self, source_dir=LEVELS_DIR, cache_dir=None):
+        self.source_dir = source_dir
+        self.cache_dir = cache_dir or os.path.join(source_dir, CACHE_DIR_NAME)
+
+        # Уже отображённые уровни: номер -> CompiledLevel
+        self._loaded = {}
+        self._numbers = None
+
+    def level_numbers(self):
+        """Номера уровней, для которых есть исходники"""
+        if self._numbers is None:
+            numbers = []
+            for name in os.listdir(self.source_dir):
+                match = LEVEL_FILE_PATTERN.match(name)
+                if match:
+                    numbers.append(int(match.group(1)))
+            if not numbers:
+                raise LevelError(f"в {self.source_dir} нет уровней")
+            self._numbers = sorted(numbers)
+        return self._numbers
+
+    def resolve(self, level_number):
+        """Номер файла уровня: после последнего уровня они идут по кругу"""
+        numbers = self.level_numbers()
+        return numbers[(level_number - 1) % len(numbers)]
+
+    def load(self, level_number):
+        """Скомпилированный уровень по номеру"""
+        number = self.resolve(level_number)
+        source_path = os.path.join(self.source_dir, f"level_{number}.json")
+        source_stat = os.stat(source_path)
+        stamp = (source_stat.st_mtime_ns, source_stat.st_size)
+
+        level = self._loaded.get(number)
+        if level is not None and level.source_stamp == stamp:
+            return level
+
+        level = CompiledLevel(number, self._map_compiled(number, source_path, stamp), stamp)
+        self._loaded[number] = level
+        return level
+
+    def _map_compiled(self, number, source_path, stamp):
+        """Отображение актуального кэша в память (с пересборкой при надобности)"""
+        cache_path = os.path.join(self.cache_dir, f"level_{number}.lvl")
+
+        data = self._map_file(cache_path)
+        if data is not None:
+            (magic, version, mtime_ns, size) = HEADER.unpack_from(data)[:4]
+            if magic == MAGIC and version == VERSION and (mtime_ns, size) == stamp:
+                return data
+
+        with open(source_path, encoding="utf-8") as source_file:
+            try:
+                source = json.load(source_file)
+            except ValueError as error:
+                raise LevelError(f"{source_path}: {error}") from error
+        compiled = compile_level(source, stamp)
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temporary_path = cache_path + ".tmp"
+            with open(temporary_path, "wb") as cache_file:
+                cache_file.write(compiled)
+            os.replace(temporary_path, cache_path)
+        except OSError:
+            # Каталог только для чтения (например, внутри сборки) -
+            # пользуемся скомпилированными данными из памяти
+            return compiled
+
+        return self._map_file(cache_path) or compiled
+
+    @staticmethod
+    def _map_file(path):
+        """Файл, отображённый в память только для чтения, или None"""
+        try:
+            with open(path, "rb") as cache_file:
+                if os.fstat(cache_file.fileno()).st_size < HEADER.size:
+                    return None
+                return mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError:
+            return None
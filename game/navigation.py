@@ -0,0 +1,235 @@
+"""
+Навигационный граф платформ для врагов, преследующих игрока
+
+Вершины графа - платформы, рёбра - прыжки и падения, которые враг успевает
+совершить: траектория считается по тикам с теми же скоростью прыжка,
+гравитацией и ограничением скорости падения, что и у игрока, а
+горизонтальная дальность - по скорости ходьбы врага. Для каждой пары
+платформ заранее выбирается первое ребро кратчайшего по времени пути,
+поэтому в тике врагу достаточно одного обращения к таблице, а смена
+платформы игроком или промах при прыжке не требуют нового поиска пути.
+
+Платформы для врагов односторонние: снизу они пропускают, а приземление
+засчитывается, только когда ноги пересекают верх платформы при падении.
+"""
+import bisect
+import heapq
+import weakref
+
+
+EDGE_JUMP = "jump"
+EDGE_FALL = "fall"
+
+# Графы уже загруженных уровней: пересобираются вместе с уровнем
+_graphs = weakref.WeakKeyDictionary()
+
+
+class NavEdge:
+    """Переход с платформы на платформу
+
+    takeoff_x - центр врага на исходной платформе, откуда он прыгает или
+    сходит с края; landing_x - центр врага над целевой платформой, к
+    которому он подруливает в воздухе; cost - оценка времени в тиках.
+    """
+
+    __slots__ = ("source", "target", "action", "takeoff_x", "landing_x", "cost")
+
+    def __init__(self, source, target, action, takeoff_x, landing_x, cost):
+        self.source = source
+        self.target = target
+        self.action = action
+        self.takeoff_x = takeoff_x
+        self.landing_x = landing_x
+        self.cost = cost
+
+
+class NavGraph:
+    """Граф достижимости платформ и таблица первых рёбер путей"""
+
+    def __init__(self, platforms, jump_velocity, gravity, max_fall_speed,
+                 speed, body_width, max_depth):
+        # Платформы как (x, y, width, height), номера - индексы в списке
+        self.platforms = [tuple(platform) for platform in platforms]
+        self.speed = speed
+        self.body_width = body_width
+
+        self.jump_offsets, self.jump_apex = self._trajectory(
+            jump_velocity, gravity, max_fall_speed, max_depth
+        )
+        self.fall_offsets, self.fall_apex = self._trajectory(
+            0, gravity, max_fall_speed, max_depth
+        )
+
+        # Дальше этого по горизонтали враг не улетит ни прыжком, ни падением
+        self.max_reach = speed * max(len(self.jump_offsets), len(self.fall_offsets))
+
+        self.edges = [[] for _ in self.platforms]
+        self._build_edges()
+
+        # next_edge[откуда][куда] - первое ребро пути или None
+        self.next_edge = self._build_routes()
+
+    @staticmethod
+    def _trajectory(velocity, gravity, max_fall_speed, max_depth):
+        """Смещения ног по тикам от точки отрыва и тик вершины
+
+        Порядок как в World: сначала скорость, затем положение.
+        """
+        offsets = [0.0]
+        offset = 0.0
+        apex = 0
+        while offset <= max_depth:
+            velocity = min(velocity + gravity, max_fall_speed)
+            offset += velocity
+            offsets.append(offset)
+            if velocity <= 0:
+                apex = len(offsets) - 1
+        return offsets, apex
+
+    @staticmethod
+    def _air_ticks(offsets, apex, depth):
+        """Тик, на котором ноги при падении пересекают уровень depth
+
+        depth - на сколько цель ниже точки отрыва (выше - отрицательно).
+        None, если траектория не поднимается над целью с запасом.
+        """
+        if offsets[apex] >= depth - 1:
+            return None
+        tick = bisect.bisect_left(offsets, depth, apex)
+        if tick >= len(offsets):
+            return None
+        return tick
+
+    def _build_edges(self):
+        """Рёбра между платформами, до которых хватает дальности"""
+        platforms = self.platforms
+        order = sorted(range(len(platforms)), key=lambda index: platforms[index][0])
+        lefts = [platforms[index][0] for index in order]
+        widest = max((platform[2] for platform in platforms), default=0)
+        reach = self.max_reach + self.body_width
+
+        for source, (x, y, width, height) in enumerate(platforms):
+            # Кандидаты - только платформы в пределах дальности по x
+            first = bisect.bisect_left(lefts, x - reach - widest)
+            last = bisect.bisect_right(lefts, x + width + reach)
+            for target in order[first:last]:
+                if target != source:
+                    edge = self._best_edge(source, target)
+                    if edge is not None:
+                        self.edges[source].append(edge)
+
+    def _best_edge(self, source, target):
+        """Самый быстрый прыжок или падение с source на target (или None)"""
+        x, y, width, _ = self.platforms[source]
+        target_x, target_y, target_width, _ = self.platforms[target]
+        right = x + width
+        target_right = target_x + target_width
+        depth = target_y - y
+
+        # Центр врага над целевой платформой - с отступом от края
+        inset = min(self.body_width / 2, target_width / 2)
+        landing_left = target_x + inset
+        landing_right = target_right - inset
+
+        # Центр на исходной платформе: от середины до точки отрыва
+        middle = x + width / 2
+
+        # Центр, при котором тело уже не над исходной платформой
+        clearance = self.body_width / 2 + 1
+        candidates = []
+
+        # Прыжок с ближнего к цели края или из-под цели
+        jump_ticks = self._air_ticks(self.jump_offsets, self.jump_apex, depth)
+        if jump_ticks is not None:
+            takeoff = None
+            if target_x >= right:
+                takeoff, landing = right, landing_left
+                if depth >= 0:
+                    # Цель не выше: на обратном пути враг не должен
+                    # приземлиться на исходную платформу
+                    landing = max(landing, right + clearance)
+            elif target_right <= x:
+                takeoff, landing = x, landing_right
+                if depth >= 0:
+                    landing = min(landing, x - clearance)
+            elif depth < 0:
+                # Цель выше и перекрывается по x: прыжок сквозь неё
+                takeoff = min(max(middle, landing_left), landing_right)
+                takeoff = min(max(takeoff, x), right)
+                landing = min(max(takeoff, landing_left), landing_right)
+
+            if takeoff is not None and landing_left <= landing <= landing_right:
+                if depth >= 0:
+                    # Край исходной платформы пройден до возвращения на её уровень
+                    home_ticks = self._air_ticks(self.jump_offsets, self.jump_apex, 0)
+                    reachable = clearance <= self.speed * (home_ticks - 1)
+                else:
+                    reachable = True
+                if reachable and abs(landing - takeoff) <= self.speed * (jump_ticks - 1):
+                    candidates.append((EDGE_JUMP, takeoff, landing, jump_ticks))
+
+        # Шаг с края на более низкую платформу
+        if depth > 0:
+            fall_ticks = self._air_ticks(self.fall_offsets, self.fall_apex, depth)
+            if fall_ticks is not None:
+                for takeoff in (right + clearance, x - clearance):
+                    landing = min(max(takeoff, landing_left), landing_right)
+                    if abs(landing - takeoff) <= self.speed * (fall_ticks - 1):
+                        candidates.append((EDGE_FALL, takeoff, landing, fall_ticks))
+
+        best = None
+        for action, takeoff, landing, air_ticks in candidates:
+            cost = air_ticks + abs(takeoff - middle) / self.speed
+            if best is None or cost < best.cost:
+                best = NavEdge(source, target, action, takeoff, landing, cost)
+        return best
+
+    def _build_routes(self):
+        """Первые рёбра кратчайших путей между всеми парами платформ
+
+        Дейкстра от каждой цели по обратным рёбрам: для каждой платформы
+        запоминается ребро, с которого начинается её лучший путь к цели.
+        """
+        count = len(self.platforms)
+        incoming = [[] for _ in range(count)]
+        for edges in self.edges:
+            for edge in edges:
+                incoming[edge.target].append(edge)
+
+        routes = [[None] * count for _ in range(count)]
+        for target in range(count):
+            distance = {target: 0.0}
+            queue = [(0.0, target)]
+            while queue:
+                cost, node = heapq.heappop(queue)
+                if cost > distance[node]:
+                    continue
+                for edge in incoming[node]:
+                    source = edge.source
+                    new_cost = cost + edge.cost
+                    if new_cost < distance.get(source, float("inf")):
+                        distance[source] = new_cost
+                        routes[source][target] = edge
+                        heapq.heappush(queue, (new_cost, source))
+        return routes
+
+    def edge_count(self):
+        """Число рёбер графа"""
+        return sum(len(edges) for edges in self.edges)
+
+
+def graph_for_level(level, jump_velocity, gravity, max_fall_speed, speed,
+                    body_width, max_depth):
+    """Граф уровня (CompiledLevel) из кэша или построенный заново
+
+    Уровни неизменны, пока не изменится исходник, а при его изменении
+    LevelLibrary создаёт новый CompiledLevel - и граф строится заново.
+    """
+    graph = _graphs.get(level)
+    if graph is None:
+        graph = NavGraph(
+            level.platforms, jump_velocity, gravity, max_fall_speed,
+            speed, body_width, max_depth
+        )
+        _graphs[level] = graph
+    return graph
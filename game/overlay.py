@@ -0,0 +1,64 @@
+"""
+Сообщение поверх игровой сцены
+"""
+from PyQt6.QtCore import QPointF, QRectF, Qt
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QGraphicsItem
+from game import styles
+
+
+class MessageOverlay(QGraphicsItem):
+    """Сообщение (пауза, смерть, уровень пройден) элементом сцены
+
+    В отличие от QMessageBox не запускает вложенный цикл событий: тик,
+    в котором сообщение появилось, завершается как обычно, а кадры
+    продолжают идти по таймеру.
+    """
+
+    WIDTH = 360
+    HEIGHT = 120
+    TITLE_HEIGHT = 50
+
+    def __init__(self):
+        super().__init__()
+        self.title = ""
+        self.text = ""
+
+        self.title_font = QFont()
+        self.title_font.setPointSize(16)
+        self.title_font.setBold(True)
+        self.text_font = QFont()
+        self.text_font.setPointSize(11)
+
+        # Выше игровых элементов, ниже панели профилировщика
+        self.setZValue(900)
+        self.hide()
+
+    def show_message(self, title, text, center):
+        """Показ сообщения с центром в точке сцены center"""
+        self.title = title
+        self.text = text
+        self.setPos(center - QPointF(self.WIDTH / 2, self.HEIGHT / 2))
+        self.update()
+        self.show()
+
+    def boundingRect(self):
+        """Прямоугольник сообщения (с контуром)"""
+        return QRectF(-1, -1, self.WIDTH + 2, self.HEIGHT + 2)
+
+    def paint(self, painter, option, widget=None):
+        """Полупрозрачная плашка с заголовком и текстом"""
+        painter.setBrush(styles.brush("overlay"))
+        painter.setPen(styles.pen("overlay"))
+        painter.drawRoundedRect(QRectF(0, 0, self.WIDTH, self.HEIGHT), 8, 8)
+
+        painter.setFont(self.title_font)
+        painter.drawText(
+            QRectF(0, 0, self.WIDTH, self.TITLE_HEIGHT),
+            Qt.AlignmentFlag.AlignCenter, self.title
+        )
+        painter.setFont(self.text_font)
+        painter.drawText(
+            QRectF(0, self.TITLE_HEIGHT, self.WIDTH, self.HEIGHT - self.TITLE_HEIGHT),
+            Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop, self.text
+        )
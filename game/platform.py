@@ -2,16 +2,21 @@
 Класс платформы
 """
 from PyQt6.QtWidgets import QGraphicsRectItem
-from PyQt6.QtGui import QBrush, QColor, QPen
-from PyQt6.QtCore import Qt
+from game import styles
 
 
 class Platform(QGraphicsRectItem):
-    """Класс платформы"""
+    """Графический элемент платформы (состояние - в PlatformState)"""
 
-    def __init__(self, x, y, width, height):
-        super().__init__(0, 0, width, height)
-        self.setBrush(QBrush(QColor(101, 67, 33)))
-        self.setPen(QPen(Qt.GlobalColor.black, 2))
-        self.setPos(x, y)
+    def __init__(self, state):
+        super().__init__(0, 0, state.width, state.height)
 
+        self.setBrush(styles.brush("platform"))
+        self.setPen(styles.pen())
+        self.reset(state)
+
+    def reset(self, state):
+        """Привязка элемента к состоянию (в том числе при выдаче из пула)"""
+        self.state = state
+        self.setRect(0, 0, state.width, state.height)
+        self.setPos(state.x, state.y)
@@ -0,0 +1,151 @@
+"""
+Профилировщик кадра по фазам
+"""
+import csv
+import time
+
+
+class FrameProfiler:
+    """Время фаз кадра в кольцевом буфере с перцентилями
+
+    Кадр - один вызов GameWindow.update_game (в нём может быть несколько
+    шагов симуляции, время одинаковых фаз складывается). mark(phase)
+    относит к фазе время, прошедшее с предыдущей отметки.
+    """
+
+    PHASES = (
+        "input", "player", "enemies", "swords", "coins", "level_check",
+        "scene", "render", "repaint"
+    )
+    CAPACITY = 600
+
+    def __init__(self, capacity=CAPACITY, clock=time.perf_counter):
+        self.capacity = capacity
+        self.clock = clock
+
+        self.samples = {phase: [0.0] * capacity for phase in self.PHASES}
+        self.totals = [0.0] * capacity
+        self.steps = [0] * capacity
+
+        self.index = -1
+        self.count = 0
+        self.frame_number = 0
+
+        self._frame_start = 0.0
+        self._last_mark = 0.0
+        self._paint_start = None
+
+    def begin_frame(self):
+        """Начало кадра: новая строка буфера"""
+        self.index = (self.index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.frame_number += 1
+
+        for values in self.samples.values():
+            values[self.index] = 0.0
+        self.totals[self.index] = 0.0
+        self.steps[self.index] = 0
+
+        self._frame_start = self._last_mark = self.clock()
+
+    def mark(self, phase):
+        """Отнести к фазе время с предыдущей отметки"""
+        now = self.clock()
+        self.samples[phase][self.index] += now - self._last_mark
+        self._last_mark = now
+
+    def count_step(self):
+        """Учёт шага симуляции в текущем кадре"""
+        self.steps[self.index] += 1
+
+    def end_frame(self):
+        """Конец кадра: полное время кадра без перерисовки"""
+        self.totals[self.index] = self.clock() - self._frame_start
+
+    def begin_paint(self):
+        """Начало перерисовки сцены"""
+        self._paint_start = self.clock()
+
+    def end_paint(self):
+        """Конец перерисовки: время добавляется к последнему кадру"""
+        if self._paint_start is None or self.index < 0:
+            return
+        elapsed = self.clock() - self._paint_start
+        self._paint_start = None
+        self.samples["repaint"][self.index] += elapsed
+        self.totals[self.index] += elapsed
+
+    def _values(self, series):
+        """Заполненная часть кольцевого буфера"""
+        return series[:self.count]
+
+    @staticmethod
+    def percentile(values, percent):
+        """Перцентиль методом ближайшего ранга"""
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        rank = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+        return ordered[rank]
+
+    def stats(self, phase=None):
+        """(p50, p95, p99, max) в миллисекундах для фазы или всего кадра"""
+        series = self.totals if phase is None else self.samples[phase]
+        values = self._values(series)
+        if not values:
+            return 0.0, 0.0, 0.0, 0.0
+        return tuple(
+            value * 1000 for value in (
+                self.percentile(values, 50),
+                self.percentile(values, 95),
+                self.percentile(values, 99),
+                max(values),
+            )
+        )
+
+    def worst_frame(self):
+        """Самый долгий кадр буфера: (номер кадра, время в мс, фазы в мс)"""
+        values = self._values(self.totals)
+        if not values:
+            return None
+
+        index = max(range(len(values)), key=values.__getitem__)
+        age = (self.index - index) % self.capacity
+        phases = {phase: self.samples[phase][index] * 1000 for phase in self.PHASES}
+        return self.frame_number - age, values[index] * 1000, phases
+
+    def report(self):
+        """Текстовый отчёт по фазам"""
+        lines = ["фаза          p50     p95     p99     max (мс)"]
+        for phase in self.PHASES + (None,):
+            p50, p95, p99, worst = self.stats(phase)
+            name = phase or "кадр"
+            lines.append(f"{name:<12}{p50:>7.2f} {p95:>7.2f} {p99:>7.2f} {worst:>7.2f}")
+
+        worst = self.worst_frame()
+        if worst:
+            frame_number, total, phases = worst
+            slowest = max(phases, key=phases.get)
+            lines.append(
+                f"худший кадр #{frame_number}: {total:.2f} мс "
+                f"(больше всего - {slowest}, {phases[slowest]:.2f} мс)"
+            )
+        return "\n".join(lines)
+
+    def dump_csv(self, path):
+        """Выгрузка замеров буфера в CSV (от старых кадров к новым)"""
+        first_number = self.frame_number - self.count + 1
+        start = (self.index - self.count + 1) % self.capacity
+
+        with open(path, "w", newline="", encoding="utf-8") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(
+                ["frame", "steps"] + [f"{phase}_ms" for phase in self.PHASES] + ["total_ms"]
+            )
+            for offset in range(self.count):
+                index = (start + offset) % self.capacity
+                writer.writerow(
+                    [first_number + offset, self.steps[index]]
+                    + [f"{self.samples[phase][index] * 1000:.4f}" for phase in self.PHASES]
+                    + [f"{self.totals[index] * 1000:.4f}"]
+                )
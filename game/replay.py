@@ -0,0 +1,192 @@
+"""
+Запись ввода по тикам и детерминированное воспроизведение без графики
+
+Формат файла (little-endian):
+    заголовок  "PLRP", версия (B), начальный уровень (H)
+    кадры      пары (маска ввода B, длина серии B) - RLE по тикам
+    окончание  количество тиков (I), контрольная сумма мира (I)
+"""
+import argparse
+import struct
+import sys
+import time
+
+from game.world import World, InputFrame, EVENT_DEATH, EVENT_LEVEL_COMPLETE
+
+
+MAGIC = b"PLRP"
+VERSION = 1
+
+HEADER = struct.Struct("<4sBH")
+TRAILER = struct.Struct("<II")
+
+# Биты маски ввода
+LEFT = 1
+RIGHT = 2
+JUMP = 4
+ATTACK = 8
+
+MAX_RUN = 255
+
+
+class ReplayError(Exception):
+    """Повреждённая или несовместимая запись"""
+
+
+def encode_input(inputs):
+    """Маска ввода из InputFrame"""
+    return (
+        (LEFT if inputs.left else 0)
+        | (RIGHT if inputs.right else 0)
+        | (JUMP if inputs.jump else 0)
+        | (ATTACK if inputs.attack else 0)
+    )
+
+
+def decode_input(mask):
+    """InputFrame из маски ввода"""
+    return InputFrame(
+        left=bool(mask & LEFT),
+        right=bool(mask & RIGHT),
+        jump=bool(mask & JUMP),
+        attack=bool(mask & ATTACK)
+    )
+
+
+def apply_level_events(world, events):
+    """Смена уровня по событиям шага - так же, как это делает GameScene"""
+    for event, entity in events:
+        if event == EVENT_DEATH:
+            world.load_level(world.level)
+        elif event == EVENT_LEVEL_COMPLETE:
+            world.load_level(world.level + 1)
+
+
+class InputRecorder:
+    """Запись ввода каждого тика в память с сохранением в файл"""
+
+    def __init__(self, start_level=1):
+        self.start_level = start_level
+        self.runs = bytearray()
+        self.tick_count = 0
+
+        self._last_mask = None
+        self._run_length = 0
+
+    def record(self, inputs):
+        """Запись ввода очередного тика"""
+        mask = encode_input(inputs)
+        if mask == self._last_mask and self._run_length < MAX_RUN:
+            self._run_length += 1
+        else:
+            self._flush_run()
+            self._last_mask = mask
+            self._run_length = 1
+        self.tick_count += 1
+
+    def _flush_run(self):
+        if self._run_length:
+            self.runs += bytes((self._last_mask, self._run_length))
+            self._run_length = 0
+
+    def save(self, path, world):
+        """Сохранение записи с контрольной суммой конечного состояния мира"""
+        self._flush_run()
+        with open(path, "wb") as replay_file:
+            replay_file.write(HEADER.pack(MAGIC, VERSION, self.start_level))
+            replay_file.write(self.runs)
+            replay_file.write(TRAILER.pack(self.tick_count, world.checksum()))
+
+
+class Replay:
+    """Загруженная запись"""
+
+    def __init__(self, start_level, masks, checksum):
+        self.start_level = start_level
+        self.masks = masks
+        self.checksum = checksum
+
+    @classmethod
+    def load(cls, path):
+        """Чтение записи из файла"""
+        with open(path, "rb") as replay_file:
+            data = replay_file.read()
+
+        if len(data) < HEADER.size + TRAILER.size:
+            raise ReplayError("файл записи слишком короткий")
+
+        magic, version, start_level = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ReplayError("это не файл записи")
+        if version != VERSION:
+            raise ReplayError(f"неподдерживаемая версия записи: {version}")
+
+        tick_count, checksum = TRAILER.unpack_from(data, len(data) - TRAILER.size)
+        runs = data[HEADER.size:len(data) - TRAILER.size]
+        if len(runs) % 2:
+            raise ReplayError("повреждены данные ввода")
+
+        masks = bytearray()
+        for offset in range(0, len(runs), 2):
+            masks += bytes((runs[offset],)) * runs[offset + 1]
+
+        if len(masks) != tick_count:
+            raise ReplayError("количество тиков не совпадает с заголовком")
+
+        return cls(start_level, bytes(masks), checksum)
+
+    def play(self, world=None):
+        """Прогон записи без отрисовки и таймеров, возвращает мир"""
+        if world is None:
+            world = World()
+        world.load_level(self.start_level)
+
+        # Ввод декодируется один раз на каждую из 16 масок
+        frames = [decode_input(mask) for mask in range(16)]
+        step = world.step
+        for mask in self.masks:
+            events = step(frames[mask])
+            if events:
+                apply_level_events(world, events)
+        return world
+
+
+def main(argv=None):
+    """Воспроизведение записи из командной строки с проверкой синхронизации"""
+    parser = argparse.ArgumentParser(description="Воспроизведение записи игры без графики")
+    parser.add_argument("path", help="файл записи")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="сколько раз прогнать запись (для замеров)")
+    vectorized = parser.add_mutually_exclusive_group()
+    vectorized.add_argument("--vectorized", dest="vectorized", action="store_true",
+                            default=None, help="всегда использовать NumPy для врагов")
+    vectorized.add_argument("--scalar", dest="vectorized", action="store_false",
+                            help="никогда не использовать NumPy для врагов")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat должен быть не меньше 1")
+
+    replay = Replay.load(args.path)
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        world = replay.play(World(vectorized=args.vectorized))
+    elapsed = time.perf_counter() - started
+
+    ticks = len(replay.masks) * args.repeat
+    rate = ticks / elapsed if elapsed else float("inf")
+    print(f"тиков: {ticks}, время: {elapsed:.3f} с, {rate:.0f} тиков/с")
+
+    if world.checksum() != replay.checksum:
+        print(
+            f"РАССИНХРОНИЗАЦИЯ: контрольная сумма {world.checksum():08x}, "
+            f"ожидалась {replay.checksum:08x}"
+        )
+        return 1
+
+    print(f"контрольная сумма совпадает: {replay.checksum:08x}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+Настройки запуска из переменных окружения
+"""
+import os
+
+
+def env_flag(name, default=False):
+    """Логический флаг из переменной окружения (1/true/yes/on)"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_int(name, default):
+    """Целое число из переменной окружения"""
+    value = os.environ.get(name)
+    if value is None or not value.strip():
+        return default
+    return int(value)
+
+
+# Профилирование кадров: замеры по фазам, экранная панель и выгрузка в CSV
+PROFILE = env_flag("PLATFORMER_PROFILE")
+PROFILE_OVERLAY = env_flag("PLATFORMER_PROFILE_OVERLAY")
+PROFILE_CSV = os.environ.get("PLATFORMER_PROFILE_CSV", "")
+
+# Запись ввода по тикам в файл для воспроизведения (python -m game.replay)
+RECORD_PATH = os.environ.get("PLATFORMER_RECORD", "")
+
+# Небо и платформы рисуются из готовых картинок, вид сцены настроен
+# под много движущихся элементов (0 - прежняя отрисовка для сравнения)
+STATIC_LAYER = env_flag("PLATFORMER_STATIC_LAYER", True)
+
+# Монеты (и платформы без статического слоя) рисуются пакетными
+# элементами - одним вызовом на всех (0 - отдельный элемент на объект)
+BATCH_ITEMS = env_flag("PLATFORMER_BATCH", True)
+
+# Уровень детализации симуляции врагов: ближе LOD_ACTIVE_DISTANCE пикселей
+# от игрока враг обновляется каждый тик, дальше LOD_SLEEP_DISTANCE - спит,
+# между ними - раз в LOD_THROTTLE_INTERVAL тиков с соответственно большим шагом
+LOD_ACTIVE_DISTANCE = env_int("PLATFORMER_LOD_ACTIVE", 800)
+LOD_SLEEP_DISTANCE = env_int("PLATFORMER_LOD_SLEEP", 1600)
+LOD_THROTTLE_INTERVAL = env_int("PLATFORMER_LOD_INTERVAL", 4)
+
+# Враги рядом с игроком преследуют его по навигационному графу платформ
+# вместо патрулирования (замедленные и спящие враги патрулируют)
+CHASE_ENEMIES = env_flag("PLATFORMER_CHASE")
+
+# Тики симуляции в отдельном потоке: окно отображает снимки состояния
+# мира, и работа интерфейса не задерживает физику
+SIMULATION_THREAD = env_flag("PLATFORMER_SIM_THREAD")
+
+# При выходе в консоль печатается загрузка процессора по состояниям
+# игрового окна: игра, пауза, сообщение, вне игры
+CPU_REPORT = env_flag("PLATFORMER_CPU")
+
+# Замер запуска: фазы и время до первой отрисовки главного меню
+# печатаются в консоль; STARTUP_QUIT закрывает программу после отчёта
+# (для серии замеров python -m ui.startup)
+STARTUP_PROFILE = env_flag("PLATFORMER_STARTUP")
+STARTUP_QUIT = env_flag("PLATFORMER_STARTUP_QUIT")
@@ -0,0 +1,312 @@
+"""
+Симуляция в отдельном потоке со снимками состояния для отрисовки
+"""
+import collections
+import time
+
+from PyQt6.QtCore import QObject, QThread, QTimer, Qt, pyqtSignal, pyqtSlot
+from game.game_loop import FixedStepLoop
+from game.spatial_hash import SpatialHash
+from game.world import (
+    World, InputFrame, EVENT_KILL, EVENT_COIN, EVENT_DEATH, EVENT_LEVEL_COMPLETE
+)
+
+
+# Команды очереди ввода
+INPUT_PRESS = "press"
+INPUT_RELEASE = "release"
+INPUT_JUMP = "jump"
+INPUT_ATTACK = "attack"
+
+# События тика, которые нужны окну (счёт, статистика, смена состояния игры)
+FORWARDED_EVENTS = (EVENT_KILL, EVENT_COIN, EVENT_DEATH, EVENT_LEVEL_COMPLETE)
+
+PlayerView = collections.namedtuple("PlayerView", "x y health is_attacking")
+EnemyView = collections.namedtuple("EnemyView", "slot x y")
+
+
+class Snapshot:
+    """Неизменяемое состояние мира после тика - всё, что нужно отрисовке
+
+    Движущиеся сущности копируются в кортежи (PlayerView, EnemyView), а
+    платформы, монеты и мечи передаются своими состояниями: их координаты
+    не меняются, а остальные поля отрисовка не читает. Поля width,
+    height, active_chunks, active_platforms и platform_grid совпадают с
+    полями World, которые читает StaticLayer.
+    """
+
+    __slots__ = (
+        "tick", "time", "generation", "width", "height", "active_chunks",
+        "active_platforms", "platform_grid", "player", "enemies", "coins",
+        "swords", "lod_counts", "candidate_pairs"
+    )
+
+    CHUNK_WIDTH = World.CHUNK_WIDTH
+    chunk_of = World.chunk_of
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError("снимок состояния не изменяется")
+
+
+class SimulationWorker(QObject):
+    """Тики World по своему таймеру в потоке симуляции
+
+    Ввод приходит через очередь inputs, события для окна уходят через
+    очередь events (collections.deque: добавление и извлечение атомарны,
+    блокировок нет ни у одной стороны), а после тиков публикуется новый
+    снимок - присваиванием ссылки latest. Загрузка уровня, пуск и
+    остановка тиков выполняются в потоке симуляции между тиками через
+    SimulationThread.call.
+    """
+
+    # Синхронный вызов функции в потоке симуляции: [функция, аргументы, результат, ошибка]
+    invoke = pyqtSignal(object)
+
+    def __init__(self, world, step, frame_time):
+        super().__init__()
+        self.world = world
+        self.frame_time = frame_time
+        self.frame_loop = FixedStepLoop(step)
+        self.timer = None
+
+        # Тики остановлены смертью или прохождением уровня: до загрузки
+        # уровня окном они не возобновляются (даже после снятия паузы)
+        self.halted = False
+
+        self.inputs = collections.deque()
+        self.events = collections.deque()
+        self.latest = None
+
+        # Состояние ввода, как у GameScene без потока
+        self.keys_pressed = set()
+        self.jump_requested = False
+        self.attack_requested = False
+
+        # Запись ввода (PLATFORMER_RECORD) ведётся там, где выполняются тики
+        self.recorder = None
+
+        # Номер загрузки уровня: по его смене сцена пересобирает элементы
+        self.generation = 0
+        self.platform_grid = None
+
+        # Кортежи, которые не меняются, пока не сменятся активные чанки
+        self.platforms = ()
+        self.platforms_source = None
+        self.coins = None
+
+    @pyqtSlot(object)
+    def _invoke(self, request):
+        """Выполнение запроса call() в потоке симуляции"""
+        function, args = request[0], request[1]
+        try:
+            request[2] = function(*args)
+        except Exception as error:
+            request[3] = error
+
+    def set_running(self, running):
+        """Пуск и остановка тиков (время остановки не накапливается)"""
+        if self.timer is None:
+            # Таймер создаётся в потоке симуляции и срабатывает в нём же
+            self.timer = QTimer()
+            self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+            self.timer.timeout.connect(self.tick)
+
+        self.frame_loop.reset()
+        if running and not self.halted:
+            self.timer.start(self.frame_time)
+        else:
+            self.timer.stop()
+
+    def set_recorder(self, recorder):
+        """Запись ввода новой игры (или None)"""
+        self.recorder = recorder
+
+    def load_level(self, level_number):
+        """Загрузка уровня, возвращает его первый снимок"""
+        world = self.world
+        world.load_level(level_number)
+
+        self.keys_pressed.clear()
+        self.inputs.clear()
+        self.jump_requested = False
+        self.attack_requested = False
+
+        # Своя сетка платформ для отрисовки: сетку мира опрашивают тики
+        self.platform_grid = SpatialHash()
+        for platform in world.platforms:
+            self.platform_grid.insert(platform, *platform.bounds())
+
+        self.halted = False
+        self.generation += 1
+        self.coins = None
+        return self.publish()
+
+    def take_input(self):
+        """Ввод очередного тика из накопленных событий клавиатуры и мыши"""
+        inputs = self.inputs
+        while inputs:
+            command, key = inputs.popleft()
+            if command == INPUT_PRESS:
+                self.keys_pressed.add(key)
+            elif command == INPUT_RELEASE:
+                self.keys_pressed.discard(key)
+            elif command == INPUT_JUMP:
+                self.jump_requested = True
+            elif command == INPUT_ATTACK:
+                self.attack_requested = True
+
+        frame = InputFrame(
+            left=Qt.Key.Key_A in self.keys_pressed,
+            right=Qt.Key.Key_D in self.keys_pressed,
+            jump=self.jump_requested,
+            attack=self.attack_requested
+        )
+        self.jump_requested = False
+        self.attack_requested = False
+        return frame
+
+    @pyqtSlot()
+    def tick(self):
+        """Шаги симуляции, накопившиеся по монотонным часам, и новый снимок"""
+        steps = self.frame_loop.advance()
+        if steps == 0:
+            return
+
+        for _ in range(steps):
+            inputs = self.take_input()
+            if self.recorder:
+                self.recorder.record(inputs)
+
+            stop = False
+            for event, _ in self.world.step(inputs):
+                if event in FORWARDED_EVENTS:
+                    self.events.append(event)
+                if event == EVENT_COIN:
+                    self.coins = None
+                elif event in (EVENT_DEATH, EVENT_LEVEL_COMPLETE):
+                    stop = True
+
+            # После смерти и прохождения уровня тики ждут окно: уровень
+            # перезагружается до следующего тика, как и без потока
+            if stop:
+                self.halted = True
+                self.set_running(False)
+                break
+
+        self.publish()
+
+    def publish(self):
+        """Снимок текущего состояния мира в latest"""
+        world = self.world
+        player = world.player
+
+        if world.active_platforms is not self.platforms_source:
+            self.platforms_source = world.active_platforms
+            self.platforms = tuple(world.active_platforms)
+            self.coins = None
+        if self.coins is None:
+            self.coins = tuple(world.active_coins())
+
+        snapshot = Snapshot(
+            tick=world.tick,
+            time=time.perf_counter(),
+            generation=self.generation,
+            width=world.width,
+            height=world.height,
+            active_chunks=world.active_chunks,
+            active_platforms=self.platforms,
+            platform_grid=self.platform_grid,
+            player=PlayerView(player.x, player.y, player.health, player.is_attacking),
+            enemies=tuple(
+                EnemyView(enemy.slot, enemy.x, enemy.y) for enemy in world.active_enemies
+            ),
+            coins=self.coins,
+            swords=tuple(world.swords),
+            lod_counts=world.lod_counts,
+            candidate_pairs=world.candidate_pairs,
+        )
+        self.latest = snapshot
+        return snapshot
+
+
+class SimulationThread:
+    """Поток симуляции (PLATFORMER_SIM_THREAD) и обмен с ним из потока окна
+
+    Окно не обращается к World, пока поток работает: ввод отправляется
+    через send_* без ожидания, отрисовка берёт последний снимок latest(),
+    события тиков забираются take_events(), а редкие управляющие действия
+    (загрузка уровня, пауза, запись) выполняются через call() - синхронно
+    и только между тиками.
+    """
+
+    def __init__(self, world, step, frame_time):
+        self.thread = QThread()
+        self.thread.setObjectName("simulation")
+        self.worker = SimulationWorker(world, step, frame_time)
+        self.worker.moveToThread(self.thread)
+        self.worker.invoke.connect(
+            self.worker._invoke, Qt.ConnectionType.BlockingQueuedConnection
+        )
+        self.thread.start()
+
+    def call(self, function, *args):
+        """Вызов function(*args) в потоке симуляции с ожиданием результата"""
+        if not self.thread.isRunning():
+            return function(*args)
+
+        request = [function, args, None, None]
+        self.worker.invoke.emit(request)
+        if request[3] is not None:
+            raise request[3]
+        return request[2]
+
+    def stop(self):
+        """Остановка тиков и потока (при освобождении сцены)"""
+        if self.thread.isRunning():
+            self.call(self.worker.set_running, False)
+            self.thread.quit()
+            self.thread.wait()
+
+    def set_running(self, running):
+        """Пуск и остановка тиков"""
+        self.call(self.worker.set_running, running)
+
+    def set_recorder(self, recorder):
+        """Запись ввода новой игры (или None)"""
+        self.call(self.worker.set_recorder, recorder)
+
+    def load_level(self, level_number):
+        """Загрузка уровня между тиками, возвращает первый снимок уровня"""
+        return self.call(self.worker.load_level, level_number)
+
+    def latest(self):
+        """Последний опубликованный снимок"""
+        return self.worker.latest
+
+    def take_events(self):
+        """События тиков, накопившиеся с прошлого вызова"""
+        events = self.worker.events
+        taken = []
+        while events:
+            taken.append(events.popleft())
+        return taken
+
+    def send_press(self, key):
+        """Нажатие клавиши"""
+        self.worker.inputs.append((INPUT_PRESS, key))
+
+    def send_release(self, key):
+        """Отпускание клавиши"""
+        self.worker.inputs.append((INPUT_RELEASE, key))
+
+    def send_jump(self):
+        """Прыжок в начале следующего тика"""
+        self.worker.inputs.append((INPUT_JUMP, None))
+
+    def send_attack(self):
+        """Атака в начале следующего тика"""
+        self.worker.inputs.append((INPUT_ATTACK, None))
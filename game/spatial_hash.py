@@ -0,0 +1,105 @@
+"""
+Пространственный хэш для широкой фазы коллизий
+"""
+
+
+class SpatialHash:
+    """Равномерная сетка: объект хранится во всех ячейках, которые он задевает"""
+
+    CELL_SIZE = 100
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+
+        # Ячейка -> список объектов
+        self._cells = {}
+        # Объект -> (порядковый номер, диапазон ячеек)
+        self._entries = {}
+        self._next_order = 0
+
+        # Количество кандидатов, выданных запросами (для статистики кадра)
+        self.pairs_tested = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, obj):
+        return obj in self._entries
+
+    def order(self, obj):
+        """Порядковый номер добавления объекта (порядок выдачи query)"""
+        return self._entries[obj][0]
+
+    def clear(self):
+        """Удаление всех объектов"""
+        self._cells.clear()
+        self._entries.clear()
+        self._next_order = 0
+
+    def insert(self, obj, x, y, width, height):
+        """Добавление объекта с прямоугольником (x, y, width, height)"""
+        cell_range = self._cell_range(x, y, width, height)
+        self._entries[obj] = (self._next_order, cell_range)
+        self._next_order += 1
+        self._add_to_cells(obj, cell_range)
+
+    def move(self, obj, x, y, width, height):
+        """Перенос объекта; ячейки меняются только при выходе за их границы"""
+        order, old_range = self._entries[obj]
+        new_range = self._cell_range(x, y, width, height)
+        if new_range == old_range:
+            return
+
+        self._remove_from_cells(obj, old_range)
+        self._add_to_cells(obj, new_range)
+        self._entries[obj] = (order, new_range)
+
+    def remove(self, obj):
+        """Удаление объекта"""
+        entry = self._entries.pop(obj, None)
+        if entry:
+            self._remove_from_cells(obj, entry[1])
+
+    def query(self, x, y, width, height):
+        """Объекты из ячеек прямоугольника в порядке добавления"""
+        x0, y0, x1, y1 = self._cell_range(x, y, width, height)
+        cells = self._cells
+
+        found = set()
+        for cell_x in range(x0, x1 + 1):
+            for cell_y in range(y0, y1 + 1):
+                bucket = cells.get((cell_x, cell_y))
+                if bucket:
+                    found.update(bucket)
+
+        self.pairs_tested += len(found)
+
+        # Порядок добавления сохраняет поведение прежних проходов по спискам
+        entries = self._entries
+        return sorted(found, key=lambda obj: entries[obj][0])
+
+    def _cell_range(self, x, y, width, height):
+        """Диапазон ячеек (x0, y0, x1, y1), задетых прямоугольником"""
+        size = self.cell_size
+        return (
+            int(x // size), int(y // size),
+            int((x + width) // size), int((y + height) // size)
+        )
+
+    def _add_to_cells(self, obj, cell_range):
+        x0, y0, x1, y1 = cell_range
+        cells = self._cells
+        for cell_x in range(x0, x1 + 1):
+            for cell_y in range(y0, y1 + 1):
+                cells.setdefault((cell_x, cell_y), []).append(obj)
+
+    def _remove_from_cells(self, obj, cell_range):
+        x0, y0, x1, y1 = cell_range
+        cells = self._cells
+        for cell_x in range(x0, x1 + 1):
+            for cell_y in range(y0, y1 + 1):
+                bucket = cells.get((cell_x, cell_y))
+                if bucket:
+                    bucket.remove(obj)
+                    if not bucket:
+                        del cells[(cell_x, cell_y)]
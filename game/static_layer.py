@@ -0,0 +1,137 @@
+"""
+Статический слой сцены: небо и платформы, запечённые в одну картинку
+"""
+from PyQt6.QtCore import QPointF, QRectF
+from PyQt6.QtGui import QBrush, QPainter, QPixmap, QTransform
+from game import styles
+from game.collision import PEN_MARGIN
+
+
+class StaticLayer:
+    """Картинка неподвижной части активных чанков мира
+
+    Платформы не двигаются, поэтому вместо отдельных элементов сцены они
+    один раз рисуются вместе с небом в QPixmap, который становится
+    текстурой фоновой кисти сцены: при перерисовке кадра Qt копирует из
+    неё только открытую часть, не обходя элементы платформ. Картинка
+    покрывает активные чанки и пересобирается при их смене.
+    """
+
+    # Поле за границей мира: окно вида обычно чуть больше сцены, и
+    # полосы по краям тоже должны браться из картинки
+    MARGIN = 64
+
+    def __init__(self, world):
+        # World или снимок потока симуляции с теми же полями (Snapshot)
+        self.world = world
+
+        self.pixmap = None
+        self.left = 0
+        self.top = 0
+
+        # Активные чанки, для которых собрана картинка
+        self.chunks = None
+
+    def clear(self):
+        """Сброс картинки (при загрузке уровня)"""
+        self.pixmap = None
+        self.chunks = None
+
+    def rect(self):
+        """Покрытая картинкой область в координатах сцены"""
+        if self.pixmap is None:
+            return QRectF()
+        return QRectF(self.left, self.top, self.pixmap.width(), self.pixmap.height())
+
+    def brush(self):
+        """Фоновая кисть с картинкой активных чанков"""
+        if self.chunks != self.world.active_chunks:
+            self._bake()
+
+        brush = QBrush(self.pixmap)
+        brush.setTransform(QTransform.fromTranslate(self.left, self.top))
+        return brush
+
+    def draw_partial(self, painter, rect, brush):
+        """Отрисовка rect, который картинка покрывает не целиком
+
+        Так бывает, когда окно намного больше мира. Покрытая часть
+        заливается кистью с картинкой, а остальное - небом с платформами,
+        нарисованными напрямую (контуры платформ выступают за границу
+        мира на толщину пера).
+        """
+        layer = self.rect()
+        painter.fillRect(rect.intersected(layer), brush)
+
+        painter.save()
+        painter.setBrush(styles.brush("platform"))
+        painter.setPen(styles.pen())
+
+        # Полосы вне картинки узкие, и платформ рядом с ними немного
+        for strip in self._outside_strips(rect, layer):
+            painter.setClipRect(strip)
+            painter.fillRect(strip, styles.brush("sky"))
+            self._draw_platforms(painter, self.world.platform_grid.query(
+                strip.x() - PEN_MARGIN, strip.y() - PEN_MARGIN,
+                strip.width() + 2 * PEN_MARGIN, strip.height() + 2 * PEN_MARGIN
+            ))
+        painter.restore()
+
+    @staticmethod
+    def _outside_strips(rect, layer):
+        """Части rect вне layer: полосы сверху, снизу, слева и справа"""
+        top = max(rect.top(), layer.top())
+        bottom = min(rect.bottom(), layer.bottom())
+        strips = []
+        if rect.top() < layer.top():
+            strips.append(QRectF(rect.left(), rect.top(), rect.width(), layer.top() - rect.top()))
+        if rect.bottom() > layer.bottom():
+            strips.append(QRectF(
+                rect.left(), layer.bottom(), rect.width(), rect.bottom() - layer.bottom()
+            ))
+        if bottom > top:
+            if rect.left() < layer.left():
+                strips.append(QRectF(rect.left(), top, layer.left() - rect.left(), bottom - top))
+            if rect.right() > layer.right():
+                strips.append(QRectF(layer.right(), top, rect.right() - layer.right(), bottom - top))
+        return strips
+
+    @staticmethod
+    def _draw_platforms(painter, platforms):
+        """Прямоугольники платформ текущими пером и кистью"""
+        for platform in platforms:
+            painter.drawRect(QRectF(platform.x, platform.y, platform.width, platform.height))
+
+    def _bake(self):
+        """Сборка картинки: небо и платформы активных чанков
+
+        У краёв мира картинка захватывает поле MARGIN: там только небо
+        и выступающие контуры крайних платформ.
+        """
+        world = self.world
+        first, last = world.active_chunks
+        last_chunk = world.chunk_of(max(world.width - 1, 0))
+
+        if first <= 0:
+            self.left = -self.MARGIN
+        else:
+            self.left = first * world.CHUNK_WIDTH
+        if last >= last_chunk:
+            right = world.width + self.MARGIN
+        else:
+            right = (last + 1) * world.CHUNK_WIDTH
+        self.top = -self.MARGIN
+        bottom = world.height + self.MARGIN
+
+        pixmap = QPixmap(int(right - self.left), int(bottom - self.top))
+        pixmap.fill(styles.brush("sky").color())
+
+        painter = QPainter(pixmap)
+        painter.translate(QPointF(-self.left, -self.top))
+        painter.setBrush(styles.brush("platform"))
+        painter.setPen(styles.pen())
+        self._draw_platforms(painter, world.active_platforms)
+        painter.end()
+
+        self.pixmap = pixmap
+        self.chunks = world.active_chunks
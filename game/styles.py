@@ -0,0 +1,53 @@
+"""
+Общие кисти и перья игровых элементов
+"""
+from PyQt6.QtGui import QBrush, QColor, QPen
+from PyQt6.QtCore import Qt
+
+
+# Цвета заливки по (роль, состояние)
+BRUSH_COLORS = {
+    ("sky", None): (135, 206, 235),
+    ("platform", None): (101, 67, 33),
+    ("enemy", None): (255, 0, 0),
+    ("coin", None): (255, 215, 0),
+    ("sword", None): (192, 192, 192),
+    ("player", "attack"): (255, 255, 0),
+    ("player", "healthy"): (0, 128, 255),
+    ("player", "wounded"): (255, 165, 0),
+    ("player", "critical"): (255, 0, 0),
+
+    # Сообщение поверх сцены: полупрозрачная плашка
+    ("overlay", None): (0, 0, 0, 170),
+}
+
+# Перья по роли: (цвет, толщина)
+PEN_STYLES = {
+    "outline": (Qt.GlobalColor.black, 2),
+    "overlay": (Qt.GlobalColor.white, 2),
+}
+
+_brushes = {}
+_pens = {}
+
+
+def brush(role, state=None):
+    """Общая кисть для роли и состояния
+
+    Кисти создаются один раз и раздаются всем элементам; Qt копирует их
+    с общим счётчиком ссылок, поэтому изменять полученный объект нельзя.
+    """
+    key = (role, state)
+    cached = _brushes.get(key)
+    if cached is None:
+        cached = _brushes[key] = QBrush(QColor(*BRUSH_COLORS[key]))
+    return cached
+
+
+def pen(role="outline"):
+    """Общее перо для роли (изменять полученный объект нельзя)"""
+    cached = _pens.get(role)
+    if cached is None:
+        color, width = PEN_STYLES[role]
+        cached = _pens[role] = QPen(color, width)
+    return cached
@@ -0,0 +1,895 @@
+"""
+Игровой мир без Qt: состояние сущностей и шаг симуляции
+"""
+import struct
+import zlib
+
+from game.collision import (
+    PEN_MARGIN, aabb_overlap, circle_aabb_overlap, swept_vertical_overlap
+)
+from game.spatial_hash import SpatialHash
+from game.enemy_system import EnemySystem
+from game.levels import LevelLibrary
+from game.navigation import EDGE_JUMP, graph_for_level
+from game import settings
+
+
+# События шага симуляции: (тип, сущность)
+EVENT_ATTACK = "attack"
+EVENT_SWORD_END = "sword_end"
+EVENT_DAMAGE = "damage"
+EVENT_KILL = "kill"
+EVENT_COIN = "coin"
+EVENT_DEATH = "death"
+EVENT_LEVEL_COMPLETE = "level_complete"
+
+
+# Стартовая позиция игрока до загрузки первого уровня
+PLAYER_START = (50, 400)
+
+# Общий набор уровней: скомпилированные файлы отображаются в память один раз
+_default_levels = None
+
+
+def default_levels():
+    """Набор уровней из каталога levels/"""
+    global _default_levels
+    if _default_levels is None:
+        _default_levels = LevelLibrary()
+    return _default_levels
+
+
+class InputFrame:
+    """Ввод за один тик"""
+
+    __slots__ = ("left", "right", "jump", "attack")
+
+    def __init__(self, left=False, right=False, jump=False, attack=False):
+        self.left = left
+        self.right = right
+        self.jump = jump
+        self.attack = attack
+
+
+class PlayerState:
+    """Состояние игрока"""
+
+    __slots__ = (
+        "x", "y", "velocity_y", "is_on_ground",
+        "health", "max_health", "is_attacking", "attack_frame"
+    )
+
+    WIDTH = 40
+    HEIGHT = 50
+    MOVE_SPEED = 5
+    JUMP_VELOCITY = -12
+    MAX_VELOCITY_Y = 15
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.velocity_y = 0
+        self.is_on_ground = False
+
+        self.health = 100
+        self.max_health = 100
+
+        self.is_attacking = False
+        self.attack_frame = 0
+
+    def bounds(self):
+        """Прямоугольник игрока (x, y, width, height)"""
+        return self.x, self.y, self.WIDTH, self.HEIGHT
+
+
+class PlatformState:
+    """Состояние платформы"""
+
+    __slots__ = ("x", "y", "width", "height", "index", "_bounds")
+
+    def __init__(self, x, y, width, height, index=0):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+        # Номер платформы в уровне (вершина навигационного графа)
+        self.index = index
+
+        # Платформы неподвижны: прямоугольник вычисляется один раз
+        self._bounds = (x, y, width, height)
+
+    def bounds(self):
+        """Прямоугольник платформы (x, y, width, height)"""
+        return self._bounds
+
+
+class EnemyState:
+    """Состояние врага"""
+
+    __slots__ = (
+        "x", "y", "start_x", "direction", "alive", "index", "slot", "chunk",
+        "spawn", "chasing", "velocity_y", "platform", "landing_x"
+    )
+
+    WIDTH = 35
+    HEIGHT = 35
+    MOVE_SPEED = 2
+    PATROL_DISTANCE = 100
+
+    def __init__(self, x, y, slot=0, chunk=0):
+        self.x = x
+        self.y = y
+        self.start_x = x
+        self.direction = 1
+        self.alive = True
+
+        # Номер в массивах EnemySystem
+        self.index = -1
+
+        # Номер врага в уровне: разносит обновления замедленных врагов по тикам
+        self.slot = slot
+
+        # Чанк, в списке которого числится враг
+        self.chunk = chunk
+
+        # Преследование игрока (PLATFORMER_CHASE): точка появления, скорость
+        # падения, платформа под ногами (None - в воздухе) и центр, к
+        # которому враг подруливает в прыжке
+        self.spawn = (x, y)
+        self.chasing = False
+        self.velocity_y = 0
+        self.platform = None
+        self.landing_x = None
+
+    def bounds(self):
+        """Прямоугольник врага (x, y, width, height)"""
+        return self.x, self.y, self.WIDTH, self.HEIGHT
+
+
+class CoinState:
+    """Состояние монеты"""
+
+    __slots__ = ("x", "y", "center_x", "center_y", "collected", "_bounds")
+
+    SIZE = 20
+    RADIUS = SIZE / 2
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.center_x = x + self.RADIUS
+        self.center_y = y + self.RADIUS
+        self.collected = False
+        self._bounds = (x, y, self.SIZE, self.SIZE)
+
+    def bounds(self):
+        """Описанный прямоугольник монеты (x, y, width, height)"""
+        return self._bounds
+
+
+class SwordState:
+    """Состояние меча (атака)"""
+
+    __slots__ = ("x", "y", "direction_right", "frame_count", "_bounds")
+
+    WIDTH = 50
+    HEIGHT = 10
+    ATTACK_DURATION = 10
+
+    def __init__(self, player_x, player_y, direction_right):
+        if direction_right:
+            self.x = player_x + 40
+        else:
+            self.x = player_x - 50
+        self.y = player_y + 20
+
+        self.direction_right = direction_right
+        self.frame_count = 0
+
+        # Меч не двигается за время атаки
+        self._bounds = (self.x, self.y, self.WIDTH, self.HEIGHT)
+
+    def bounds(self):
+        """Прямоугольник меча (x, y, width, height)"""
+        return self._bounds
+
+    def is_active(self):
+        """Проверка активности меча"""
+        return self.frame_count < self.ATTACK_DURATION
+
+
+class World:
+    """Игровой мир: правила GameScene без графики"""
+
+    WIDTH = 800
+    HEIGHT = 600
+    GRAVITY = 0.5
+
+    ATTACK_COOLDOWN_TIME = 20
+    CONTACT_DAMAGE = 10
+    FALL_DAMAGE = 50
+    KNOCKBACK = 30
+    COIN_SCORE = 10
+    ENEMY_SCORE = 50
+
+    # Запас области поиска кандидатов: контур элементов шире на толщину пера
+    COLLISION_MARGIN = 2 * PEN_MARGIN
+
+    # Мир делится на вертикальные полосы (чанки); симулируются и
+    # отображаются только чанки не дальше ACTIVE_CHUNK_RADIUS от игрока
+    CHUNK_WIDTH = 800
+    ACTIVE_CHUNK_RADIUS = 1
+
+    def __init__(self, vectorized=None, levels=None):
+        self.levels = levels or default_levels()
+
+        # Размеры мира и старт игрока задаются уровнем
+        self.width = self.WIDTH
+        self.height = self.HEIGHT
+        self.player_start = PLAYER_START
+
+        self.player = PlayerState(*PLAYER_START)
+
+        self.platforms = []
+        self.enemies = []
+        self.coins = []
+        self.swords = []
+
+        # Сущности по чанкам и активная часть мира
+        self.chunk_platforms = {}
+        self.chunk_enemies = {}
+        self.chunk_coins = {}
+        self.active_chunks = None
+        self.active_platforms = []
+        self.active_enemies = []
+
+        # Активные чанки сменились на последнем тике
+        self.chunks_changed = False
+
+        # Преследующий враг покинул активные чанки на последнем тике
+        # (сорвался с уровня и вернулся на дальнюю точку появления)
+        self.active_enemies_changed = False
+
+        # Широкая фаза: платформы добавляются один раз при загрузке уровня,
+        # враги переносятся по ячейкам каждый тик
+        self.platform_grid = SpatialHash()
+        self.enemy_grid = SpatialHash()
+        self.coin_grid = SpatialHash()
+
+        # Количество пар-кандидатов, проверенных за последний тик
+        self.candidate_pairs = 0
+
+        # Векторизованные враги: True - всегда, False - никогда,
+        # None - при наличии NumPy и большом числе врагов на уровне
+        self.vectorized = vectorized
+        self.enemy_system = EnemySystem() if EnemySystem.available() else None
+        self.use_enemy_system = False
+
+        # Враги, сдвинувшиеся за последний тик
+        self.moved_enemies = []
+
+        # Уровень детализации симуляции врагов по расстоянию до игрока
+        self.lod_active_distance = settings.LOD_ACTIVE_DISTANCE
+        self.lod_sleep_distance = settings.LOD_SLEEP_DISTANCE
+        self.lod_throttle_interval = max(1, settings.LOD_THROTTLE_INTERVAL)
+
+        # Врагов на последнем тике: (активных, замедленных, спящих)
+        self.lod_counts = (0, 0, 0)
+
+        # Преследование игрока по навигационному графу платформ уровня
+        # вместо патрулирования (для врагов рядом с игроком)
+        self.chase = settings.CHASE_ENEMIES
+        self.navigation = None
+
+        # Платформа, на которую игрок приземлился последней (номер или None)
+        self.player_platform = None
+
+        # Профилировщик фаз тика (FrameProfiler) или None
+        self.profiler = None
+
+        self.level = 1
+        self.tick = 0
+        self.score = 0
+        self.attack_cooldown = 0
+
+    def reset(self):
+        """Сброс счётчиков игры перед новой игрой в том же мире
+
+        После reset() и load_level() мир совпадает с только что созданным:
+        запись новой игры воспроизводится с нуля, а замедление врагов
+        считается от нулевого тика.
+        """
+        self.tick = 0
+        self.score = 0
+        self.attack_cooldown = 0
+
+        player = self.player
+        player.velocity_y = 0
+        player.is_on_ground = False
+        player.health = player.max_health
+        player.is_attacking = False
+        player.attack_frame = 0
+
+    def load_level(self, level_number):
+        """Загрузка уровня"""
+        self.level = level_number
+        level = self.levels.load(level_number)
+
+        self.width = level.width
+        self.height = level.height
+        self.player_start = level.player_start
+
+        self.platforms.clear()
+        self.enemies.clear()
+        self.coins.clear()
+        self.swords.clear()
+
+        self.platform_grid.clear()
+        self.enemy_grid.clear()
+        self.coin_grid.clear()
+
+        self.chunk_platforms.clear()
+        self.chunk_enemies.clear()
+        self.chunk_coins.clear()
+        self.active_chunks = None
+
+        # Сбрасываем игрока
+        player = self.player
+        player.x, player.y = self.player_start
+        player.velocity_y = 0
+        player.health = 100
+        self.player_platform = None
+
+        for index, (x, y, width, height) in enumerate(level.platforms):
+            platform = PlatformState(x, y, width, height, index)
+            self.platforms.append(platform)
+            self.platform_grid.insert(platform, *platform.bounds())
+
+            # Длинная платформа попадает во все чанки, которые задевает
+            for chunk in range(self.chunk_of(x), self.chunk_of(x + width) + 1):
+                self.chunk_platforms.setdefault(chunk, []).append(platform)
+
+        for slot, (x, y) in enumerate(level.enemies):
+            # Враг патрулирует рядом со стартом и остаётся в его чанке
+            # (преследующий переходит в чанк, куда забежал)
+            enemy = EnemyState(x, y, slot, self.chunk_of(x))
+            self.enemies.append(enemy)
+            self.enemy_grid.insert(enemy, *enemy.bounds())
+            self.chunk_enemies.setdefault(enemy.chunk, []).append(enemy)
+
+        # Граф строится один раз на уровень и берётся из кэша при перезагрузке
+        self.navigation = None
+        if self.chase:
+            self.navigation = graph_for_level(
+                level, PlayerState.JUMP_VELOCITY, self.GRAVITY,
+                PlayerState.MAX_VELOCITY_Y, EnemyState.MOVE_SPEED,
+                EnemyState.WIDTH, self.height
+            )
+
+        for x, y in level.coins:
+            coin = CoinState(x, y)
+            self.coins.append(coin)
+            self.coin_grid.insert(coin, *coin.bounds())
+            self.chunk_coins.setdefault(self.chunk_of(x), []).append(coin)
+
+        self.moved_enemies = []
+        self.update_active_chunks()
+
+    # ========================================================================
+    # ЧАНКИ
+    # ========================================================================
+
+    def chunk_of(self, x):
+        """Номер чанка по координате x"""
+        return int(x // self.CHUNK_WIDTH)
+
+    def update_active_chunks(self):
+        """Пересчёт активных чанков вокруг игрока, True при смене"""
+        center = self.chunk_of(self.player.x)
+        active = (center - self.ACTIVE_CHUNK_RADIUS, center + self.ACTIVE_CHUNK_RADIUS)
+        if active == self.active_chunks:
+            self.chunks_changed = False
+            return False
+
+        self.active_chunks = active
+        self.chunks_changed = True
+        chunks = range(active[0], active[1] + 1)
+
+        # Платформа может входить в несколько чанков - без повторов
+        platforms = {}
+        for chunk in chunks:
+            for platform in self.chunk_platforms.get(chunk, ()):
+                platforms[platform] = None
+        self.active_platforms = list(platforms)
+
+        self.active_enemies = [
+            enemy
+            for chunk in chunks
+            for enemy in self.chunk_enemies.get(chunk, ())
+            if enemy.alive
+        ]
+
+        # Преследование считается только последовательно
+        self.use_enemy_system = self.enemy_system is not None and not self.chase and (
+            self.vectorized
+            or (self.vectorized is None
+                and len(self.active_enemies) >= EnemySystem.VECTORIZE_THRESHOLD)
+        )
+        if self.use_enemy_system:
+            self.enemy_system.build(
+                self.active_enemies, self.active_platforms,
+                EnemyState.WIDTH, EnemyState.HEIGHT
+            )
+        return True
+
+    def active_coins(self):
+        """Несобранные монеты активных чанков"""
+        first, last = self.active_chunks
+        return [
+            coin
+            for chunk in range(first, last + 1)
+            for coin in self.chunk_coins.get(chunk, ())
+        ]
+
+    def checksum(self):
+        """Контрольная сумма состояния мира (для проверки воспроизведения)"""
+        player = self.player
+        values = [
+            self.tick, self.level, self.score, self.attack_cooldown,
+            player.x, player.y, player.velocity_y, player.health,
+            player.is_on_ground, player.is_attacking, player.attack_frame,
+        ]
+        for enemy in self.enemies:
+            values.extend((enemy.x, enemy.y, enemy.direction))
+        for coin in self.coins:
+            values.extend((coin.x, coin.y))
+        for sword in self.swords:
+            values.extend((sword.x, sword.y, sword.frame_count))
+
+        # Все значения как double: 302 и 302.0 дают одинаковые байты
+        return zlib.crc32(struct.pack(f"<{len(values)}d", *values))
+
+    def nearby(self, grid, entity, margin=0):
+        """Кандидаты из сетки рядом с сущностью (margin расширяет область)"""
+        x, y, width, height = entity.bounds()
+        return grid.query(
+            x - margin, y - margin, width + 2 * margin, height + 2 * margin
+        )
+
+    def step(self, inputs):
+        """Один тик симуляции, возвращает список событий
+
+        Порядок действий повторяет прежний GameScene.update_scene.
+        Прыжок и атака из inputs применяются в начале тика - так же,
+        как раньше они применялись в обработчиках событий между тиками.
+        При смерти игрока тик прерывается событием EVENT_DEATH.
+        """
+        events = []
+        player = self.player
+        profiler = self.profiler
+        self.tick += 1
+        self.moved_enemies = []
+        self.active_enemies_changed = False
+        self.update_active_chunks()
+
+        self.platform_grid.pairs_tested = 0
+        self.enemy_grid.pairs_tested = 0
+        self.coin_grid.pairs_tested = 0
+
+        if inputs.jump:
+            self.jump()
+        if inputs.attack:
+            self.sword_attack(not inputs.left, events)
+
+        if self.attack_cooldown > 0:
+            self.attack_cooldown -= 1
+
+        if profiler:
+            profiler.mark("input")
+
+        # Сначала обновляем физику (гравитацию)
+        if self._update_player(events):
+            return events
+
+        if profiler:
+            profiler.mark("player")
+
+        # Затем обрабатываем управление
+        if inputs.left:
+            self.move_left()
+        if inputs.right:
+            self.move_right()
+
+        if profiler:
+            profiler.mark("input")
+
+        self._update_enemies()
+
+        # Движение врагов не зависит от игрока, поэтому проверять касания
+        # можно после обновления всех врагов. Отброс сдвигает игрока, и
+        # кандидаты, выбранные у прежнего положения, устаревают: после
+        # отброса враги, идущие дальше по порядку, ищутся в сетке заново
+        enemy_grid = self.enemy_grid
+        candidates = self.nearby(enemy_grid, player, self.COLLISION_MARGIN)
+        index = 0
+        while index < len(candidates):
+            enemy = candidates[index]
+            index += 1
+            if aabb_overlap(player.bounds(), enemy.bounds()):
+                if self._take_damage(self.CONTACT_DAMAGE, events):
+                    return events
+                if player.x < enemy.x:
+                    player.x -= self.KNOCKBACK
+                else:
+                    player.x += self.KNOCKBACK
+
+                # Враги раньше по порядку уже проверены, как в проходе по списку
+                order = enemy_grid.order(enemy)
+                candidates = [
+                    other for other in self.nearby(enemy_grid, player, self.COLLISION_MARGIN)
+                    if enemy_grid.order(other) > order
+                ]
+                index = 0
+
+        if profiler:
+            profiler.mark("enemies")
+
+        for sword in self.swords[:]:
+            sword.frame_count += 1
+            if not sword.is_active():
+                self.swords.remove(sword)
+                events.append((EVENT_SWORD_END, sword))
+                continue
+
+            sword_bounds = sword.bounds()
+            for enemy in self.nearby(self.enemy_grid, sword, self.COLLISION_MARGIN):
+                if aabb_overlap(sword_bounds, enemy.bounds()):
+                    self._kill_enemy(enemy)
+                    self.score += self.ENEMY_SCORE
+                    events.append((EVENT_KILL, enemy))
+                    break
+
+        if profiler:
+            profiler.mark("swords")
+
+        player_bounds = player.bounds()
+        for coin in self.nearby(self.coin_grid, player, self.COLLISION_MARGIN):
+            # Контур монеты тоже шире на половину толщины пера
+            if circle_aabb_overlap(coin.center_x, coin.center_y,
+                                   coin.RADIUS + PEN_MARGIN, player_bounds):
+                self._collect_coin(coin)
+                self.score += self.COIN_SCORE
+                events.append((EVENT_COIN, coin))
+
+        if profiler:
+            profiler.mark("coins")
+
+        self.candidate_pairs = (
+            self.platform_grid.pairs_tested
+            + self.enemy_grid.pairs_tested
+            + self.coin_grid.pairs_tested
+        )
+
+        if len(self.coins) == 0 and len(self.enemies) == 0:
+            events.append((EVENT_LEVEL_COMPLETE, None))
+
+        if profiler:
+            profiler.mark("level_check")
+
+        return events
+
+    # ========================================================================
+    # ИГРОК
+    # ========================================================================
+
+    def _update_player(self, events):
+        """Физика игрока, возвращает True при смерти"""
+        player = self.player
+
+        if player.is_attacking:
+            player.attack_frame += 1
+            if player.attack_frame > 10:
+                player.is_attacking = False
+                player.attack_frame = 0
+
+        # Применяем гравитацию
+        player.velocity_y += self.GRAVITY
+
+        if player.velocity_y > player.MAX_VELOCITY_Y:
+            player.velocity_y = player.MAX_VELOCITY_Y
+
+        # Только вертикальное движение через velocity_y
+        old_y = player.y
+        player.y = old_y + player.velocity_y
+
+        # Проверка коллизий с платформами
+        player.is_on_ground = False
+        # Платформы ищем с запасом на смещение игрока при приземлении
+        nearby_platforms = self.nearby(self.platform_grid, player, player.MAX_VELOCITY_Y)
+        for platform in nearby_platforms:
+            # Проверка по всему пути за тик: быстрое падение
+            # не проскакивает сквозь тонкие платформы
+            if swept_vertical_overlap(player.x, old_y, player.y, player.WIDTH,
+                                      player.HEIGHT, platform.bounds()):
+                if player.velocity_y > 0:
+                    # Приземление на платформу
+                    player.y = platform.y - player.HEIGHT
+                    player.velocity_y = 0
+                    player.is_on_ground = True
+                    self.player_platform = platform.index
+                elif player.velocity_y < 0:
+                    # Удар головой о платформу
+                    player.y = platform.y + platform.height
+                    player.velocity_y = 0
+
+        # Проверка границ по X
+        if player.x < 0:
+            player.x = 0
+        elif player.x > self.width - player.WIDTH:
+            player.x = self.width - player.WIDTH
+
+        # Падение за пределы экрана
+        if player.y > self.height:
+            if self._take_damage(self.FALL_DAMAGE, events):
+                return True
+            self.reset_player_position()
+
+        return False
+
+    def move_left(self):
+        """Движение влево"""
+        player = self.player
+        player.x = max(player.x - player.MOVE_SPEED, 0)
+
+    def move_right(self):
+        """Движение вправо"""
+        player = self.player
+        player.x = min(player.x + player.MOVE_SPEED, self.width - player.WIDTH)
+
+    def jump(self):
+        """Прыжок"""
+        player = self.player
+        if player.is_on_ground:
+            player.velocity_y = player.JUMP_VELOCITY
+            player.is_on_ground = False
+
+    def sword_attack(self, direction_right, events):
+        """Выполнение атаки мечом"""
+        if self.attack_cooldown > 0:
+            return
+
+        player = self.player
+        sword = SwordState(player.x, player.y, direction_right)
+        self.swords.append(sword)
+        events.append((EVENT_ATTACK, sword))
+
+        self.attack_cooldown = self.ATTACK_COOLDOWN_TIME
+
+        # Запуск анимации атаки
+        player.is_attacking = True
+        player.attack_frame = 0
+
+    def _take_damage(self, damage, events):
+        """Получение урона, возвращает True при смерти"""
+        player = self.player
+        player.health -= damage
+        events.append((EVENT_DAMAGE, damage))
+
+        if player.health <= 0:
+            player.health = 0
+            events.append((EVENT_DEATH, None))
+            return True
+        return False
+
+    def reset_player_position(self):
+        """Сброс позиции игрока"""
+        player = self.player
+        player.x, player.y = self.player_start
+        player.velocity_y = 0
+
+    # ========================================================================
+    # ВРАГИ И МОНЕТЫ
+    # ========================================================================
+
+    def _update_enemies(self):
+        """Патрулирование врагов активных чанков с учётом расстояния до игрока"""
+        if self.use_enemy_system:
+            ticks, active, throttled = self.enemy_system.activity(
+                self.player.x, self.tick, self.lod_active_distance,
+                self.lod_sleep_distance, self.lod_throttle_interval
+            )
+            moved = self.enemy_system.step(
+                EnemyState.MOVE_SPEED, EnemyState.PATROL_DISTANCE, self.GRAVITY, ticks
+            )
+        else:
+            moved = []
+            active = throttled = 0
+            chase = self.chase
+            for enemy in self.active_enemies:
+                ticks = self._enemy_ticks(enemy)
+                if ticks == 1:
+                    active += 1
+                elif ticks is not None:
+                    throttled += 1
+                if not ticks:
+                    continue
+
+                old_x = enemy.x
+                old_y = enemy.y
+                if chase and ticks == 1:
+                    self._chase_enemy(enemy)
+                else:
+                    if enemy.chasing:
+                        self._stop_chase(enemy)
+                    self._update_enemy(enemy, ticks)
+                if enemy.x != old_x or enemy.y != old_y:
+                    moved.append(enemy)
+
+            if chase:
+                self._update_enemy_chunks(moved)
+
+        for enemy in moved:
+            self.enemy_grid.move(enemy, enemy.x, enemy.y, enemy.WIDTH, enemy.HEIGHT)
+        self.moved_enemies = moved
+
+        # Спящими считаются и враги неактивных чанков
+        self.lod_counts = (active, throttled, len(self.enemies) - active - throttled)
+
+    def _enemy_ticks(self, enemy):
+        """На сколько тиков продвинуть врага в этом тике
+
+        1 - враг рядом с игроком и обновляется каждый тик; None - враг
+        слишком далеко и спит. Замедленный враг получает 0, а в свой тик
+        (раз в lod_throttle_interval тиков) - весь пропущенный интервал.
+        """
+        distance = abs(enemy.x - self.player.x)
+        if distance <= self.lod_active_distance:
+            return 1
+        if distance > self.lod_sleep_distance:
+            return None
+
+        interval = self.lod_throttle_interval
+        if (self.tick + enemy.slot) % interval == 0:
+            return interval
+        return 0
+
+    def _update_enemy(self, enemy, ticks=1):
+        """Патрулирование врага (ticks тиков одним шагом)"""
+        enemy.x += enemy.MOVE_SPEED * enemy.direction * ticks
+
+        if abs(enemy.x - enemy.start_x) > enemy.PATROL_DISTANCE:
+            enemy.direction *= -1
+
+        enemy.y += self.GRAVITY * ticks
+
+        bounds = enemy.bounds()
+        nearby_platforms = self.nearby(self.platform_grid, enemy, self.COLLISION_MARGIN)
+        for platform in nearby_platforms:
+            if aabb_overlap(bounds, platform.bounds()):
+                enemy.y = platform.y - enemy.HEIGHT
+                break
+
+    def _chase_enemy(self, enemy):
+        """Преследование игрока на один тик
+
+        На платформе враг идёт к точке отрыва первого ребра пути к
+        платформе игрока (одно обращение к таблице графа), а если игрок на
+        той же платформе или до него не добраться - к игроку, не сходя с
+        края. В воздухе действует гравитация, и враг подруливает к центру
+        приземления; промах - просто приземление на другую платформу,
+        откуда путь снова берётся из таблицы.
+        """
+        enemy.chasing = True
+        speed = enemy.MOVE_SPEED
+        center = enemy.x + enemy.WIDTH / 2
+
+        if enemy.platform is None:
+            if enemy.landing_x is not None:
+                dx = min(max(enemy.landing_x - center, -speed), speed)
+                enemy.x += dx
+                if dx:
+                    enemy.direction = 1 if dx > 0 else -1
+
+            enemy.velocity_y = min(enemy.velocity_y + self.GRAVITY, PlayerState.MAX_VELOCITY_Y)
+            old_bottom = enemy.y + enemy.HEIGHT
+            enemy.y += enemy.velocity_y
+            if enemy.velocity_y > 0:
+                self._land_enemy(enemy, old_bottom)
+
+            # Сорвавшийся с уровня враг возвращается на точку появления
+            if enemy.y > self.height:
+                enemy.x, enemy.y = enemy.spawn
+                enemy.velocity_y = 0
+                enemy.landing_x = None
+            return
+
+        platform = self.platforms[enemy.platform]
+        target = self.player_platform
+        edge = None
+        if target is not None and target != enemy.platform:
+            edge = self.navigation.next_edge[enemy.platform][target]
+
+        if edge is None:
+            player_center = self.player.x + PlayerState.WIDTH / 2
+            goal = min(max(player_center, platform.x), platform.x + platform.width)
+        else:
+            goal = edge.takeoff_x
+
+        dx = goal - center
+        if abs(dx) > speed:
+            enemy.direction = 1 if dx > 0 else -1
+            enemy.x += speed * enemy.direction
+
+            # Тело сошло с платформы по пути к точке отрыва: падение
+            # начинается сразу, а не после дохода до точки
+            if enemy.x >= platform.x + platform.width or enemy.x + enemy.WIDTH <= platform.x:
+                enemy.platform = None
+                enemy.landing_x = edge.landing_x if edge is not None else None
+                enemy.velocity_y = 0
+            return
+
+        enemy.x += dx
+        if edge is not None:
+            enemy.platform = None
+            enemy.landing_x = edge.landing_x
+            enemy.velocity_y = PlayerState.JUMP_VELOCITY if edge.action == EDGE_JUMP else 0
+
+    def _land_enemy(self, enemy, old_bottom):
+        """Приземление падающего врага: ноги пересекли верх платформы"""
+        bottom = enemy.y + enemy.HEIGHT
+        landed = None
+        for platform in self.platform_grid.query(
+                enemy.x, old_bottom, enemy.WIDTH, bottom - old_bottom):
+            if (old_bottom <= platform.y <= bottom
+                    and enemy.x < platform.x + platform.width
+                    and platform.x < enemy.x + enemy.WIDTH
+                    and (landed is None or platform.y < landed.y)):
+                landed = platform
+
+        if landed is not None:
+            enemy.y = landed.y - enemy.HEIGHT
+            enemy.velocity_y = 0
+            enemy.platform = landed.index
+            enemy.landing_x = None
+
+    def _stop_chase(self, enemy):
+        """Переход от преследования к патрулированию на месте"""
+        enemy.chasing = False
+        enemy.start_x = enemy.x
+        enemy.velocity_y = 0
+        enemy.platform = None
+        enemy.landing_x = None
+
+    def _update_enemy_chunks(self, moved):
+        """Перенос преследующих врагов в чанки, куда они забежали"""
+        first, last = self.active_chunks
+        for enemy in moved:
+            chunk = self.chunk_of(enemy.x)
+            if chunk == enemy.chunk:
+                continue
+            self.chunk_enemies[enemy.chunk].remove(enemy)
+            enemy.chunk = chunk
+            self.chunk_enemies.setdefault(chunk, []).append(enemy)
+
+            # Убежавший из активной части мира враг больше не симулируется
+            if not first <= chunk <= last:
+                self.active_enemies.remove(enemy)
+                self.active_enemies_changed = True
+
+    def _kill_enemy(self, enemy):
+        """Удаление убитого врага"""
+        enemy.alive = False
+        if self.use_enemy_system:
+            self.enemy_system.remove(enemy)
+        self.enemies.remove(enemy)
+        self.active_enemies.remove(enemy)
+        self.chunk_enemies[enemy.chunk].remove(enemy)
+        self.enemy_grid.remove(enemy)
+
+    def _collect_coin(self, coin):
+        """Удаление собранной монеты"""
+        coin.collected = True
+        self.coins.remove(coin)
+        self.coin_grid.remove(coin)
+        self.chunk_coins[self.chunk_of(coin.x)].remove(coin)
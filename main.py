@@ -1,20 +1,37 @@
+import time
+
+# Отсчёт для замера запуска (PLATFORMER_STARTUP) - до остальных импортов
+STARTED = time.perf_counter()
+
 import sys
 from PyQt6.QtWidgets import QApplication
 from ui.main_window import MainWindow
 from database.db_manager import DatabaseManager
+from game import settings
 
 
 def main():
     """Инициализация и запуск приложения"""
+    probe = None
+    if settings.STARTUP_PROFILE:
+        from ui.startup import StartupProbe
+        probe = StartupProbe(STARTED, quit_after=settings.STARTUP_QUIT)
+        probe.mark("импорт")
+
     app = QApplication(sys.argv)
     app.setApplicationName("Platformer Game")
 
     # Инициализация базы данных
     db = DatabaseManager()
     db.init_database()
+    if probe:
+        probe.mark("приложение и база")
 
     # Создание и отображение главного окна
     window = MainWindow()
+    if probe:
+        probe.mark("окно")
+        probe.watch(window)
     window.show()
 
     sys.exit(app.exec())
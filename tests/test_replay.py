@@ -0,0 +1,80 @@
+"""
+Запись нескольких игр в одном окне и их воспроизведение без графики
+"""
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+pytest.importorskip("PyQt6")
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication, QInputDialog, QMessageBox
+
+from database.db_manager import DatabaseManager
+from game import settings
+from game.replay import Replay
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def game_window(tmp_path, monkeypatch):
+    """Окно игры с временной базой и без диалогов"""
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(DatabaseManager, "DB_NAME", str(tmp_path / "game_data.db"))
+    monkeypatch.setattr(QInputDialog, "getText", staticmethod(lambda *args: ("test", True)))
+    monkeypatch.setattr(
+        QMessageBox, "question",
+        staticmethod(lambda *args: QMessageBox.StandardButton.No)
+    )
+    monkeypatch.setattr(settings, "SIMULATION_THREAD", False)
+    monkeypatch.setattr(settings, "RECORD_PATH", str(tmp_path / "game1.rpl"))
+
+    app = QApplication.instance() or QApplication([])
+    DatabaseManager().init_database()
+
+    from ui.game_window import GameWindow
+    window = GameWindow()
+    yield window
+    window.dispose()
+    app.processEvents()
+
+
+def play(window, ticks):
+    """Тики игры с бегом вправо, прыжками и атаками"""
+    scene = window.game_scene
+    scene.keys_pressed.add(Qt.Key.Key_D)
+    for tick in range(ticks):
+        if tick % 40 == 0:
+            scene.jump_requested = True
+        if tick % 7 == 0:
+            scene.attack_requested = True
+        scene.update_scene()
+        if not window.state.is_playing():
+            break
+    # Игра заканчивается посреди атаки: следующая начинается не с нуля
+    scene.attack_requested = True
+    scene.update_scene()
+    scene.keys_pressed.clear()
+
+
+def test_two_games_in_one_window(game_window, tmp_path, monkeypatch):
+    paths = [tmp_path / "game1.rpl", tmp_path / "game2.rpl"]
+
+    game_window.new_game()
+    play(game_window, 300)
+    assert game_window.game_scene.world.tick > 0
+    game_window.exit_to_menu()
+
+    monkeypatch.setattr(settings, "RECORD_PATH", str(paths[1]))
+    game_window.new_game()
+    assert game_window.game_scene.world.tick == 0
+    play(game_window, 200)
+    game_window.exit_to_menu()
+
+    for path in paths:
+        replay = Replay.load(path)
+        assert replay.masks
+        assert replay.play().checksum() == replay.checksum
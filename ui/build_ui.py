@@ -0,0 +1,26 @@
+"""
+Сборка форм: компиляция всех ui/*.ui в модули ui/compiled/
+
+Запускается перед сборкой PyInstaller, чтобы готовые модули попали
+в пакет:
+
+    python -m ui.build_ui
+"""
+import glob
+import os
+import sys
+
+from ui.ui_loader import UI_DIR, compile_ui
+
+
+def main():
+    """Компиляция всех форм"""
+    sources = sorted(glob.glob(os.path.join(UI_DIR, "*.ui")))
+    for ui_path in sources:
+        target = compile_ui(ui_path)
+        print(f"{os.path.relpath(ui_path)} -> {os.path.relpath(target)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""
+Загрузка процессора по состояниям игрового окна
+"""
+import time
+
+
+class CpuMeter:
+    """Процессорное и настенное время программы по состояниям окна
+
+    Процессорное время считается для всего процесса (поток окна, поток
+    симуляции, запись в базу) и при каждой смене состояния относится к
+    предыдущему состоянию. Отчёт - доля процессора в каждом состоянии,
+    то есть стоимость простоя на паузе, в свёрнутом окне и в меню.
+    """
+
+    def __init__(self, clock=time.perf_counter, cpu_clock=time.process_time):
+        self.clock = clock
+        self.cpu_clock = cpu_clock
+
+        # Состояние -> [секунды, процессорные секунды]
+        self.totals = {}
+        self.state = None
+        self.since = 0.0
+        self.cpu_since = 0.0
+
+    def switch(self, state):
+        """Переход в state: накопленное время - предыдущему состоянию"""
+        now = self.clock()
+        cpu = self.cpu_clock()
+        if self.state is not None:
+            total = self.totals.setdefault(self.state, [0.0, 0.0])
+            total[0] += now - self.since
+            total[1] += cpu - self.cpu_since
+        self.state = state
+        self.since = now
+        self.cpu_since = cpu
+
+    def report(self):
+        """Таблица: время и доля процессора по состояниям"""
+        self.switch(self.state)
+
+        lines = ["состояние          время, с   процессор, %"]
+        for state, (seconds, cpu_seconds) in self.totals.items():
+            share = 100 * cpu_seconds / seconds if seconds else 0.0
+            lines.append(f"{state:<16} {seconds:10.1f} {share:12.2f}")
+        return "\n".join(lines)
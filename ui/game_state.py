@@ -0,0 +1,57 @@
+"""
+Состояния игры: идёт, пауза, смерть, уровень пройден
+"""
+
+PLAYING = "playing"
+PAUSED = "paused"
+DEAD = "dead"
+LEVEL_CLEARED = "level_cleared"
+
+
+class GameStateMachine:
+    """Текущее состояние игры и допустимые переходы между состояниями
+
+    Тики симуляции выполняются только в PLAYING. Остальные состояния
+    показываются сообщением поверх сцены, а не модальным окном: цикл
+    событий продолжает работать. Смерть и прохождение уровня
+    заканчиваются сами через MESSAGE_SECONDS или раньше по Enter.
+    """
+
+    TRANSITIONS = {
+        PLAYING: (PAUSED, DEAD, LEVEL_CLEARED),
+        PAUSED: (PLAYING,),
+        # Окно свернули или оставили во время сообщения - сразу на паузу
+        DEAD: (PLAYING, PAUSED),
+        LEVEL_CLEARED: (PLAYING, PAUSED),
+    }
+
+    MESSAGE_SECONDS = 2.0
+
+    # Состояния, которые заканчиваются по времени
+    TIMED = (DEAD, LEVEL_CLEARED)
+
+    def __init__(self):
+        self.state = PLAYING
+        self.entered_at = 0.0
+
+    def reset(self):
+        """Новая игра начинается в PLAYING"""
+        self.state = PLAYING
+        self.entered_at = 0.0
+
+    def is_playing(self):
+        """Идут ли тики симуляции"""
+        return self.state == PLAYING
+
+    def change(self, state, now):
+        """Переход в state в момент now (секунды монотонных часов)"""
+        if state not in self.TRANSITIONS[self.state]:
+            raise ValueError(f"недопустимый переход: {self.state} -> {state}")
+        self.state = state
+        self.entered_at = now
+
+    def remaining(self, now):
+        """Секунды до конца сообщения текущего состояния (None - без срока)"""
+        if self.state not in self.TIMED:
+            return None
+        return max(0.0, self.MESSAGE_SECONDS - (now - self.entered_at))
@@ -1,22 +1,23 @@
 """
 Игровое окно
 """
-from PyQt6.QtWidgets import QMainWindow, QMessageBox, QInputDialog
-from PyQt6.QtCore import QFile, QTimer, Qt
-from PyQt6 import uic
+from PyQt6.QtWidgets import QMainWindow, QMessageBox, QInputDialog, QGraphicsView
+from PyQt6.QtCore import QEvent, QTimer, Qt
 from game.game_scene import GameScene
+from game.game_loop import FixedStepLoop
+from game.profiler import FrameProfiler
+from game import settings
+from ui.hud_model import HudModel
+from ui.cpu_meter import CpuMeter
+from ui.game_state import GameStateMachine, PLAYING, PAUSED, DEAD, LEVEL_CLEARED
+from ui.ui_loader import load_ui
 from database.db_manager import DatabaseManager
-import sys
-import os
+import atexit
 
-
-def resource_path(relative_path):
-    """Получить абсолютный путь к ресурсу (работает с PyInstaller)"""
-    try:
-        base_path = sys._MEIPASS
-    except AttributeError:
-        base_path = os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
+try:
+    from ui.compiled import game_window_ui
+except ImportError:
+    game_window_ui = None
 
 
 class GameWindow(QMainWindow):
@@ -25,19 +26,28 @@ class GameWindow(QMainWindow):
     FPS = 60
     FRAME_TIME = 1000 // FPS
 
+    # Шаг симуляции фиксирован, таймер только будит цикл
+    SIMULATION_STEP = 1 / FPS
+
+    # Сообщение паузы, поставленной из-за свёрнутого или неактивного окна
+    INACTIVE_PAUSE = ("Пауза", "Окно неактивно\nНажмите Enter для продолжения")
+
     def __init__(self, main_window=None):
         super().__init__()
         self.main_window = main_window
         self.load_ui()
 
-        self.db = DatabaseManager()
+        # Постоянное соединение: статистика пишется в фоне, не в игровом тике
+        self.db = DatabaseManager(write_behind=True)
 
         # Игровые переменные
         self.score = 0
         self.level = 1
         self.lives = 3
         self.game_time = 0
-        self.is_paused = False
+
+        # Игра, пауза, смерть или пройденный уровень (сообщения - в сцене)
+        self.state = GameStateMachine()
 
         # НОВОЕ: Имя текущего игрока
         self.current_player = "Игрок1"
@@ -46,25 +56,103 @@ class GameWindow(QMainWindow):
         self.coins_collected = 0
         self.enemies_killed = 0
 
+        # Значения панели: виджеты обновляются раз в кадр и только изменившиеся
+        self.hud = HudModel()
+
         self.game_scene = GameScene(self)
         self.graphics_view.setScene(self.game_scene)
+        if settings.STATIC_LAYER:
+            self.tune_view()
+
+        # Профилировщик кадра (PLATFORMER_PROFILE и связанные переменные)
+        self.profiler = None
+        if settings.PROFILE or settings.PROFILE_OVERLAY or settings.PROFILE_CSV:
+            self.profiler = FrameProfiler()
+            self.game_scene.set_profiler(self.profiler, settings.PROFILE_OVERLAY)
+            atexit.register(self.report_profile)
+
+        # Симуляция идёт фиксированными шагами по монотонным часам,
+        # поэтому её скорость не зависит от точности таймера
+        self.frame_loop = FixedStepLoop(self.SIMULATION_STEP)
 
         self.game_timer = QTimer()
+        self.game_timer.setTimerType(Qt.TimerType.PreciseTimer)
         self.game_timer.timeout.connect(self.update_game)
 
         self.clock_timer = QTimer()
         self.clock_timer.timeout.connect(self.update_clock)
 
-        self.start_game()
+        # Конец сообщения о смерти или прохождении уровня: одно
+        # срабатывание вместо проверки в каждом кадре
+        self.message_timer = QTimer()
+        self.message_timer.setSingleShot(True)
+        self.message_timer.timeout.connect(self.finish_message)
+
+        # Игра идёт: от start_game до Game Over или выхода в меню
+        # (на время диалога выхода - нет)
+        self.in_game = False
+
+        # Загрузка процессора по состояниям окна (PLATFORMER_CPU)
+        self.cpu_meter = None
+        if settings.CPU_REPORT:
+            self.cpu_meter = CpuMeter()
+            self.cpu_meter.switch("вне игры")
+            atexit.register(self.report_cpu)
+
+        # Игра начинается в new_game(): окно создаётся заранее и
+        # переиспользуется между играми (ui.window_manager)
 
     def load_ui(self):
         """Загрузка UI из файла QtDesigner"""
-        # ИСПРАВЛЕНО: правильный путь для PyInstaller
-        ui_path = resource_path("ui/game_window.ui")
-        ui_file = QFile(ui_path)
-        ui_file.open(QFile.OpenModeFlag.ReadOnly)
-        uic.loadUi(ui_file, self)
-        ui_file.close()
+        # Готовый модуль формы, если он собран и актуален, иначе uic
+        load_ui(self, "ui/game_window.ui", game_window_ui)
+
+    def tune_view(self):
+        """Настройка вида под статический слой и движущиеся элементы"""
+        view = self.graphics_view
+
+        # Элементы сами задают перо и кисть и рисуются без сглаживания:
+        # сохранять состояние художника и расширять области не нужно
+        view.setOptimizationFlags(
+            QGraphicsView.OptimizationFlag.DontSavePainterState
+            | QGraphicsView.OptimizationFlag.DontAdjustForAntialiasing
+        )
+
+        # Фон уже запечён в картинку; кэш вида сдвигался бы при каждом
+        # движении камеры и скрывал бы перерисовку фона от профилировщика.
+        # Режим обновления остаётся минимальным: общий прямоугольник
+        # изменений (BoundingRectViewportUpdate) по замерам перерисовывает
+        # заметно больше, так как игрок и враги обычно далеко друг от друга
+        view.setCacheMode(QGraphicsView.CacheModeFlag.CacheNone)
+        view.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.MinimalViewportUpdate)
+
+    def new_game(self):
+        """Новая игра в уже созданном окне: сброс счёта, уровня и сцены"""
+        self.score = 0
+        self.level = 1
+        self.lives = 3
+        self.game_time = 0
+        self.coins_collected = 0
+        self.enemies_killed = 0
+
+        self.state.reset()
+        self.game_scene.hide_overlay()
+        self.game_scene.reset()
+        self.start_game()
+
+    def dispose(self):
+        """Освобождение окна при выходе: таймеры, сцена и соединение с базой"""
+        # Программу закрыли посреди игры: запись ввода сохраняется до
+        # остановки потока симуляции и освобождения сцены
+        if self.in_game:
+            self.game_scene.save_recording()
+
+        self.in_game = False
+        self.schedule_timers()
+        self.graphics_view.setScene(None)
+        self.game_scene.dispose()
+        self.game_scene = None
+        self.db.close()
 
     def start_game(self):
         """Запуск игры"""
@@ -89,37 +177,124 @@ class GameWindow(QMainWindow):
         # Передаём имя в сцену
         self.game_scene.current_player = self.current_player
 
-        self.game_timer.start(self.FRAME_TIME)
-        self.clock_timer.start(1000)
+        self.in_game = True
+        self.schedule_timers()
         self.update_ui()
+        self.flush_hud()
 
     def update_game(self):
         """Обновление игровой логики"""
-        if not self.is_paused:
-            self.game_scene.update_scene()
+        if not self.state.is_playing():
+            # Кадр, поставленный в очередь до остановки таймера
+            return
+
+        if self.profiler:
+            self.profiler.begin_frame()
+
+        if self.game_scene.simulation:
+            # Тики идут в потоке симуляции, кадр только отображает снимок
+            self.game_scene.update_from_simulation()
+        else:
+            steps = self.frame_loop.advance()
+            for _ in range(steps):
+                self.game_scene.update_scene()
+
+                # После смерти или прохождения уровня оставшиеся шаги кадра
+                # не выполняются до конца сообщения
+                if not self.state.is_playing() or not self.in_game:
+                    break
+            else:
+                self.game_scene.render(self.frame_loop.alpha)
+
+        # Урон и лечение видны в том же кадре
+        self.hud.set("health", self.game_scene.player.state.health)
+        self.flush_hud()
+
+        if self.profiler:
+            self.profiler.end_frame()
+
+    def schedule_timers(self):
+        """Таймеры и тики по состоянию игры
+
+        Кадры, игровые часы и тики идут только во время игры. На паузе,
+        в том числе при свёрнутом, скрытом или неактивном окне, окно не
+        просыпается совсем, а конец сообщения о смерти или уровне ждёт
+        одиночный таймер. При возобновлении часы симуляции сбрасываются,
+        поэтому время паузы не догоняется шагами.
+        """
+        playing = self.in_game and self.state.is_playing()
+        if playing:
+            if not self.game_timer.isActive():
+                self.frame_loop.reset()
+                self.game_timer.start(self.FRAME_TIME)
+                self.clock_timer.start(1000)
+        else:
+            self.game_timer.stop()
+            self.clock_timer.stop()
+
+        remaining = self.state.remaining(self.frame_loop.clock())
+        if self.in_game and remaining is not None:
+            self.message_timer.start(int(remaining * 1000))
+        else:
+            self.message_timer.stop()
+
+        # Без потока симуляции - ничего
+        self.game_scene.set_running(playing)
+
+        if self.cpu_meter:
+            if not self.in_game:
+                self.cpu_meter.switch("вне игры")
+            elif playing:
+                self.cpu_meter.switch("игра")
+            elif remaining is None:
+                self.cpu_meter.switch("пауза")
+            else:
+                self.cpu_meter.switch("сообщение")
+
+    def report_cpu(self):
+        """Отчёт о загрузке процессора по состояниям при выходе"""
+        print(self.cpu_meter.report())
+
+    def report_profile(self):
+        """Отчёт профилировщика при выходе и выгрузка замеров в CSV"""
+        print(self.profiler.report())
+        if settings.PROFILE_CSV:
+            self.profiler.dump_csv(settings.PROFILE_CSV)
 
     def update_clock(self):
         """Обновление игрового времени"""
-        if not self.is_paused:
+        if self.state.is_playing():
             self.game_time += 1
-            self.update_ui()
+            self.hud.set("time", self.game_time)
 
     def update_ui(self):
-        """Обновление интерфейса"""
-        self.label_score.setText(f"Счёт: {self.score}")
-        self.label_level.setText(f"Уровень: {self.level}")
-        self.label_lives.setText(f"Жизни: {self.lives}")
-
-        minutes = self.game_time // 60
-        seconds = self.game_time % 60
-        self.label_time.setText(f"Время: {minutes:02d}:{seconds:02d}")
-
-        self.progress_health.setValue(self.game_scene.player.health)
+        """Перенос всех значений в модель панели (виджеты - в flush_hud)"""
+        self.hud.set("score", self.score)
+        self.hud.set("level", self.level)
+        self.hud.set("lives", self.lives)
+        self.hud.set("time", self.game_time)
+        self.hud.set("health", self.game_scene.player.state.health)
+
+    def flush_hud(self):
+        """Обновление виджетов только для изменившихся полей панели"""
+        for field, value in self.hud.take_changes().items():
+            if field == "score":
+                self.label_score.setText(f"Счёт: {value}")
+            elif field == "level":
+                self.label_level.setText(f"Уровень: {value}")
+            elif field == "lives":
+                self.label_lives.setText(f"Жизни: {value}")
+            elif field == "time":
+                minutes = value // 60
+                seconds = value % 60
+                self.label_time.setText(f"Время: {minutes:02d}:{seconds:02d}")
+            elif field == "health":
+                self.progress_health.setValue(value)
 
     def add_score(self, points):
         """Добавление очков"""
         self.score += points
-        self.update_ui()
+        self.hud.set("score", self.score)
 
     def add_coin_collected(self):
         """Счётчик собранных монет"""
@@ -134,9 +309,11 @@ class GameWindow(QMainWindow):
     def lose_life(self):
         """Потеря жизни"""
         self.lives -= 1
-        self.update_ui()
+        self.hud.set("lives", self.lives)
 
         if self.lives <= 0:
+            # Панель обновляется до окна с результатом
+            self.flush_hud()
             self.game_over()
 
     def save_progress(self):
@@ -152,6 +329,9 @@ class GameWindow(QMainWindow):
         # Сохраняем время игры
         self.db.add_playtime(self.current_player, self.game_time)
 
+        # Записываем накопленную статистику
+        self.db.flush()
+
         QMessageBox.information(
             self,
             "Сохранено",
@@ -160,8 +340,9 @@ class GameWindow(QMainWindow):
 
     def game_over(self):
         """Окончание игры"""
-        self.game_timer.stop()
-        self.clock_timer.stop()
+        self.in_game = False
+        self.schedule_timers()
+        self.game_scene.save_recording()
 
         self.save_progress()
 
@@ -169,33 +350,72 @@ class GameWindow(QMainWindow):
         if self.main_window:
             self.main_window.show()
 
+    def set_state(self, state, title=None, text=None):
+        """Переход игры в state с сообщением поверх сцены (или без него)"""
+        self.state.change(state, self.frame_loop.clock())
+        self.schedule_timers()
+        if title is None:
+            self.game_scene.hide_overlay()
+        else:
+            self.game_scene.show_overlay(title, text)
+
+    def player_died(self):
+        """Смерть игрока (из тика): уровень перезапустится после сообщения"""
+        # Смерть попадает в статистику сразу: из сообщения можно выйти в меню
+        self.db.add_death(self.current_player)
+
+        self.set_state(
+            DEAD, "Смерть!",
+            f"Здоровье = 0\nУровень {self.level} начинается заново"
+        )
+
     def level_complete(self):
-        """Завершение уровня"""
+        """Завершение уровня (из тика): следующий уровень - после сообщения"""
         self.level += 1
         self.db.increment_level_completions(self.level - 1)
+        self.db.flush()
 
-        QMessageBox.information(
-            self,
-            "Уровень пройден!",
+        self.set_state(
+            LEVEL_CLEARED, "Уровень пройден!",
             f"Поздравляем!\nПереход на уровень {self.level}"
         )
 
-        self.game_scene.load_level(self.level)
-        self.update_ui()
+    def finish_message(self):
+        """Конец сообщения о смерти или прохождении уровня: продолжение игры"""
+        finished = self.state.state
+
+        # Уровень загружается до возобновления тиков: в потоке симуляции
+        # (PLATFORMER_SIM_THREAD) между ними не должно пройти ни одного тика
+        if finished == DEAD:
+            self.game_scene.restart_level()
+        elif finished == LEVEL_CLEARED:
+            self.game_scene.load_level(self.level)
+            self.hud.set("level", self.level)
+
+        # После Game Over игра уже остановлена; если окно за время
+        # сообщения свернули или оставили, игра не возобновляется без игрока
+        if not self.in_game:
+            return
+        if self.window_usable():
+            self.set_state(PLAYING)
+        else:
+            self.set_state(PAUSED, *self.INACTIVE_PAUSE)
 
     def pause_game(self):
-        """Пауза/возобновление игры"""
-        self.is_paused = not self.is_paused
-
-        if self.is_paused:
-            QMessageBox.information(
-                self,
-                "Пауза",
-                "Игра на паузе\nНажмите Enter для продолжения"
-            )
+        """Пауза/возобновление игры, во время сообщений - его пропуск"""
+        if self.state.state in GameStateMachine.TIMED:
+            self.finish_message()
+        elif self.state.is_playing():
+            self.set_state(PAUSED, "Пауза", "Игра на паузе\nНажмите Enter для продолжения")
+        else:
+            self.set_state(PLAYING)
 
     def exit_to_menu(self):
         """Выход в главное меню"""
+        # Пока открыт диалог, таймеры стоят: его вложенный цикл
+        # событий не должен выполнять тики и считать время игры
+        self.in_game = False
+        self.schedule_timers()
         reply = QMessageBox.question(
             self,
             "Выход в меню",
@@ -206,10 +426,11 @@ class GameWindow(QMainWindow):
         )
 
         if reply == QMessageBox.StandardButton.Cancel:
+            self.in_game = True
+            self.schedule_timers()
             return
 
-        self.game_timer.stop()
-        self.clock_timer.stop()
+        self.game_scene.save_recording()
 
         if reply == QMessageBox.StandardButton.Yes:
             self.save_progress()
@@ -218,13 +439,35 @@ class GameWindow(QMainWindow):
         if self.main_window:
             self.main_window.show()
 
+    def window_usable(self):
+        """Видит ли игрок окно и принимает ли оно ввод"""
+        return self.isVisible() and not self.isMinimized() and self.isActiveWindow()
+
+    def auto_pause(self):
+        """Пауза, если игрок не видит окно или оно не принимает ввод"""
+        if self.in_game and self.state.is_playing():
+            self.set_state(PAUSED, *self.INACTIVE_PAUSE)
+
+    def changeEvent(self, event):
+        """Пауза при сворачивании окна и переходе в другое окно"""
+        super().changeEvent(event)
+        if event.type() in (QEvent.Type.ActivationChange, QEvent.Type.WindowStateChange):
+            if self.isMinimized() or not self.isActiveWindow():
+                self.auto_pause()
+
+    def hideEvent(self, event):
+        """Пауза при скрытии окна (например, закрытии крестиком)"""
+        super().hideEvent(event)
+        self.auto_pause()
+
     def keyPressEvent(self, event):
         """Обработка нажатий клавиатуры"""
         if event.key() == Qt.Key.Key_Return or event.key() == Qt.Key.Key_Enter:
             self.pause_game()
         elif event.key() == Qt.Key.Key_Escape:
             self.exit_to_menu()
-        else:
+        elif self.state.is_playing():
+            # Во время паузы и сообщений игровой ввод не копится
             self.game_scene.handle_key_press(event)
 
     def keyReleaseEvent(self, event):
@@ -233,4 +476,5 @@ class GameWindow(QMainWindow):
 
     def mousePressEvent(self, event):
         """Обработка нажатий мыши"""
-        self.game_scene.handle_mouse_press(event)
+        if self.state.is_playing():
+            self.game_scene.handle_mouse_press(event)
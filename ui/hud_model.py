@@ -0,0 +1,33 @@
+"""
+Модель панели игры (счёт, уровень, жизни, время, здоровье)
+"""
+
+
+class HudModel:
+    """Значения панели с отметкой изменившихся полей
+
+    Окно меняет значения сколько угодно раз за кадр, а виджеты
+    обновляет раз в кадр и только для изменившихся полей.
+    """
+
+    FIELDS = ("score", "level", "lives", "time", "health")
+
+    def __init__(self):
+        self.values = dict.fromkeys(self.FIELDS)
+        self.dirty = set()
+
+    def set(self, field, value):
+        """Новое значение поля (отмечается, только если оно изменилось)"""
+        if self.values[field] != value:
+            self.values[field] = value
+            self.dirty.add(field)
+
+    def invalidate(self):
+        """Отметка всех полей (например, после смены виджетов)"""
+        self.dirty.update(self.FIELDS)
+
+    def take_changes(self):
+        """Изменившиеся поля {поле: значение} со сбросом отметок"""
+        changes = {field: self.values[field] for field in self.dirty}
+        self.dirty.clear()
+        return changes
@@ -0,0 +1,150 @@
+"""
+Модель таблицы рекордов с постраничной подгрузкой
+"""
+from collections import OrderedDict
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+class LeaderboardModel(QAbstractTableModel):
+    """Модель рекордов: страницы грузятся по ключу (score, play_time, id)"""
+
+    PAGE_SIZE = 100
+    MAX_CACHED_PAGES = 10
+
+    HEADERS = [
+        "Место", "Имя", "Счёт", "Уровень", "Время",
+        "Монет", "Убийств", "Смертей"
+    ]
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.db = db
+
+        # Кэш страниц (LRU) и ключи последних строк каждой страницы.
+        # В памяти хранится не больше MAX_CACHED_PAGES страниц строк,
+        # от прокрутки растёт только список ключей (три числа на страницу)
+        self._pages = OrderedDict()
+        self._page_keys = []
+        self._row_count = 0
+        self._exhausted = False
+
+    def reset(self):
+        """Сброс модели и повторная загрузка с первой страницы"""
+        self.beginResetModel()
+        self._pages.clear()
+        self._page_keys.clear()
+        self._row_count = 0
+        self._exhausted = False
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        """Количество уже подгруженных строк"""
+        if parent.isValid():
+            return 0
+        return self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        """Количество колонок"""
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        """Есть ли ещё непрочитанные строки"""
+        if parent.isValid():
+            return False
+        return not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Подгрузка следующей страницы"""
+        if parent.isValid() or self._exhausted:
+            return
+
+        page_number = len(self._page_keys)
+        rows = self._query_page(page_number)
+
+        if len(rows) < self.PAGE_SIZE:
+            self._exhausted = True
+        if not rows:
+            return
+
+        self.beginInsertRows(QModelIndex(), self._row_count, self._row_count + len(rows) - 1)
+        self._store_page(page_number, rows)
+        self._page_keys.append(self._row_key(rows[-1]))
+        self._row_count += len(rows)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        """Данные ячейки"""
+        if not index.isValid():
+            return None
+
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+
+        row = index.row()
+        rows = self._page(row // self.PAGE_SIZE)
+        if row % self.PAGE_SIZE >= len(rows):
+            # Таблица изменилась после подгрузки страницы
+            return None
+
+        record = rows[row % self.PAGE_SIZE]
+        (player_id, name, score, level, play_time, created_at,
+         coins, kills, deaths) = record
+
+        column = index.column()
+        if column == 0:
+            return str(row + 1)
+        if column == 1:
+            return name
+        if column == 2:
+            return str(score)
+        if column == 3:
+            return str(level)
+        if column == 4:
+            minutes = play_time // 60
+            seconds = play_time % 60
+            return f"{minutes:02d}:{seconds:02d}"
+        if column == 5:
+            return str(coins)
+        if column == 6:
+            return str(kills)
+        if column == 7:
+            return str(deaths)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        """Заголовки колонок"""
+        if (role == Qt.ItemDataRole.DisplayRole
+                and orientation == Qt.Orientation.Horizontal):
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def _page(self, page_number):
+        """Страница из кэша или повторный запрос по сохранённому ключу"""
+        rows = self._pages.get(page_number)
+        if rows is None:
+            rows = self._query_page(page_number)
+            self._store_page(page_number, rows)
+        else:
+            self._pages.move_to_end(page_number)
+        return rows
+
+    def _store_page(self, page_number, rows):
+        """Сохранение страницы в кэш с вытеснением самой старой"""
+        self._pages[page_number] = rows
+        while len(self._pages) > self.MAX_CACHED_PAGES:
+            self._pages.popitem(last=False)
+
+    def _query_page(self, page_number):
+        """Запрос страницы по ключу последней строки предыдущей страницы"""
+        after = self._page_keys[page_number - 1] if page_number > 0 else None
+        return self.db.get_leaderboard_page(after, self.PAGE_SIZE)
+
+    @staticmethod
+    def _row_key(record):
+        """Ключ сортировки строки (score, play_time, id)"""
+        return record[2], record[4], record[0]
@@ -2,21 +2,13 @@
 Главное окно приложения
 """
 from PyQt6.QtWidgets import QMainWindow, QMessageBox
-from PyQt6.QtCore import QFile
-from PyQt6 import uic
-from ui.game_window import GameWindow
-from ui.leaderboard_window import LeaderboardWindow
-import sys
-import os
+from ui.ui_loader import load_ui
+from ui.window_manager import WindowManager
 
-
-def resource_path(relative_path):
-    """Получить абсолютный путь к ресурсу (работает с PyInstaller)"""
-    try:
-        base_path = sys._MEIPASS
-    except AttributeError:
-        base_path = os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
+try:
+    from ui.compiled import main_menu_ui
+except ImportError:
+    main_menu_ui = None
 
 
 class MainWindow(QMainWindow):
@@ -26,17 +18,15 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.load_ui()
         self.setup_connections()
-        self.game_window = None
-        self.leaderboard_window = None
+
+        # Окна игры и рекордов создаются один раз после показа меню
+        self.windows = WindowManager(self)
+        self.windows.prewarm()
 
     def load_ui(self):
         """Загрузка UI из файла QtDesigner"""
-        # ИСПРАВЛЕНО: правильный путь для PyInstaller
-        ui_path = resource_path("ui/main_menu.ui")
-        ui_file = QFile(ui_path)
-        ui_file.open(QFile.OpenModeFlag.ReadOnly)
-        uic.loadUi(ui_file, self)
-        ui_file.close()
+        # Готовый модуль формы, если он собран и актуален, иначе uic
+        load_ui(self, "ui/main_menu.ui", main_menu_ui)
 
     def setup_connections(self):
         """Настройка связей сигналов и слотов"""
@@ -46,11 +36,9 @@ class MainWindow(QMainWindow):
 
     def start_new_game(self):
         """Запуск новой игры"""
-        self.game_window = GameWindow(main_window=self)
-        self.game_window.show()
+        self.windows.start_game()
         self.hide()
 
     def show_leaderboard(self):
         """Отображение таблицы рекордов"""
-        self.leaderboard_window = LeaderboardWindow()
-        self.leaderboard_window.show()
+        self.windows.show_leaderboard()
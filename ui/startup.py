@@ -0,0 +1,126 @@
+"""
+Замер времени запуска до первой отрисовки главного меню
+
+В самой игре (PLATFORMER_STARTUP=1) StartupProbe отмечает фазы запуска
+по часам perf_counter от начала main.py и печатает их после первой
+отрисовки меню. Отсюда же запускается серия замеров - из исходников
+или собранного PyInstaller файла; тогда дополнительно меряется полное
+время от создания процесса, включая старт интерпретатора и распаковку:
+
+    python -m ui.startup --runs 10
+    python -m ui.startup --runs 10 dist/main/main
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+from game.profiler import FrameProfiler
+
+
+REPORT_PREFIX = "запуск, мс:"
+FIRST_PAINT = "первая отрисовка"
+
+
+class StartupProbe:
+    """Отметки фаз запуска и отчёт после первой отрисовки окна"""
+
+    def __init__(self, started, quit_after=False):
+        self.started = started
+        self.quit_after = quit_after
+        self.marks = []
+        self.window = None
+        self.filter = None
+
+    def mark(self, name):
+        """Конец фазы name"""
+        self.marks.append((name, time.perf_counter()))
+
+    def watch(self, window):
+        """Ожидание первой отрисовки window"""
+        # Qt импортируется здесь: probe создаётся до импорта окон
+        from PyQt6.QtCore import QEvent, QObject, QTimer
+
+        probe = self
+
+        class PaintFilter(QObject):
+            def eventFilter(self, watched, event):
+                if event.type() == QEvent.Type.Paint:
+                    watched.removeEventFilter(self)
+                    probe.mark(FIRST_PAINT)
+
+                    # Отчёт после завершения отрисовки
+                    QTimer.singleShot(0, probe.report)
+                return False
+
+        self.window = window
+        self.filter = PaintFilter()
+        window.installEventFilter(self.filter)
+
+    def report(self):
+        """Печать длительности фаз и общего времени до первой отрисовки"""
+        parts = []
+        previous = self.started
+        for name, moment in self.marks:
+            if name != FIRST_PAINT:
+                parts.append(f"{name} {(moment - previous) * 1000:.1f}")
+            previous = moment
+        parts.append(f"{FIRST_PAINT} {(previous - self.started) * 1000:.1f}")
+        print(f"{REPORT_PREFIX} " + ", ".join(parts), flush=True)
+
+        if self.quit_after:
+            from PyQt6.QtWidgets import QApplication
+            QApplication.quit()
+
+
+def measure(command, cwd):
+    """Один запуск: (полное время процесса, время по отчёту игры) в мс"""
+    environment = dict(os.environ, PLATFORMER_STARTUP="1", PLATFORMER_STARTUP_QUIT="1")
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        command, cwd=cwd, env=environment, stdout=subprocess.PIPE,
+        text=True, encoding="utf-8"
+    )
+    wall = reported = None
+    for line in process.stdout:
+        if line.startswith(REPORT_PREFIX):
+            wall = (time.perf_counter() - started) * 1000
+            match = re.search(FIRST_PAINT + r" ([\d.]+)", line)
+            reported = float(match.group(1))
+    process.wait()
+    if wall is None:
+        raise RuntimeError(f"нет отчёта о запуске (код выхода {process.returncode})")
+    return wall, reported
+
+
+def main(argv=None):
+    """Серия замеров времени запуска"""
+    parser = argparse.ArgumentParser(description="Время до первой отрисовки меню")
+    parser.add_argument("command", nargs="*",
+                        help="команда запуска (по умолчанию main.py из исходников)")
+    parser.add_argument("--runs", type=int, default=10, help="число запусков")
+    args = parser.parse_args(argv)
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    command = args.command or [sys.executable, os.path.join(root, "main.py")]
+
+    walls = []
+    reports = []
+    for _ in range(args.runs):
+        wall, reported = measure(command, root)
+        walls.append(wall)
+        reports.append(reported)
+
+    percentile = FrameProfiler.percentile
+    for title, values in (("от создания процесса", walls), ("от начала main.py", reports)):
+        print(
+            f"{title}, мс: min {min(values):.1f}  p50 {percentile(values, 50):.1f}  "
+            f"max {max(values):.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Загрузка форм QtDesigner: готовые Python-модули с запасным путём через uic
+
+Файл ui/<имя>.ui заранее компилируется в модуль ui/compiled/<имя>_ui.py
+(python -m ui.build_ui), и окно строится его классом Ui_* без разбора
+XML при каждом открытии. Модуль хранит CRC32 исходника: если .ui с тех
+пор изменили или модуля нет, форма загружается через uic.loadUi, как
+раньше, а модуль пересобирается для следующих запусков.
+"""
+import os
+import sys
+import zlib
+
+
+UI_DIR = os.path.dirname(os.path.abspath(__file__))
+COMPILED_DIR_NAME = "compiled"
+
+
+def resource_path(relative_path):
+    """Получить абсолютный путь к ресурсу (работает с PyInstaller)"""
+    try:
+        base_path = sys._MEIPASS
+    except AttributeError:
+        base_path = os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
+
+
+def source_crc(ui_path):
+    """CRC32 содержимого .ui (None, если файла нет)"""
+    try:
+        with open(ui_path, "rb") as ui_file:
+            return zlib.crc32(ui_file.read())
+    except OSError:
+        return None
+
+
+def compiled_path(ui_path):
+    """Путь модуля, в который компилируется .ui"""
+    name = os.path.splitext(os.path.basename(ui_path))[0]
+    return os.path.join(UI_DIR, COMPILED_DIR_NAME, f"{name}_ui.py")
+
+
+def compile_ui(ui_path):
+    """Компиляция .ui в модуль ui/compiled/<имя>_ui.py с CRC32 исходника"""
+    # uic нужен только при сборке и на запасном пути
+    from PyQt6 import uic
+
+    target = compiled_path(ui_path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    package_init = os.path.join(os.path.dirname(target), "__init__.py")
+    if not os.path.exists(package_init):
+        with open(package_init, "w", encoding="utf-8") as init_file:
+            init_file.write('"""Формы QtDesigner, скомпилированные python -m ui.build_ui"""\n')
+
+    # Запись через временный файл: прерванная сборка не оставит
+    # наполовину записанный модуль
+    temporary = target + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as py_file:
+        uic.compileUi(ui_path, py_file)
+        py_file.write(f"\n\nSOURCE_CRC32 = {source_crc(ui_path)}\n")
+    os.replace(temporary, target)
+    return target
+
+
+def load_ui(widget, relative_path, compiled=None):
+    """Построение формы relative_path на widget
+
+    compiled - модуль из ui/compiled (None, если его не удалось
+    импортировать). Виджеты формы, как и при uic.loadUi, становятся
+    атрибутами widget.
+    """
+    ui_path = resource_path(relative_path)
+    if compiled is not None:
+        # В сборке PyInstaller исходника может не быть - тогда модуль
+        # считается актуальным
+        crc = source_crc(ui_path)
+        if crc is None or crc == compiled.SOURCE_CRC32:
+            form = compiled.Ui_MainWindow()
+            form.setupUi(widget)
+            for name, value in vars(form).items():
+                setattr(widget, name, value)
+            return
+
+    from PyQt6 import uic
+    uic.loadUi(ui_path, widget)
+
+    # Кэш пересобирается только при запуске из исходников
+    if not getattr(sys, "frozen", False):
+        try:
+            compile_ui(ui_path)
+        except OSError:
+            pass
@@ -0,0 +1,82 @@
+"""
+Жизненный цикл окон игры и таблицы рекордов
+"""
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QApplication
+
+
+class WindowManager:
+    """Окна игры и рекордов, созданные один раз и переиспользуемые
+
+    Окна строятся заранее, когда главное меню уже показано: по одному
+    за проход цикла событий, чтобы меню оставалось отзывчивым. Новая
+    игра только сбрасывает готовое окно и его сцену, а таблица рекордов
+    перечитывает данные. При выходе из программы окна освобождаются
+    вместе со сценой и соединениями с базой.
+    """
+
+    # Задержка предварительного создания окон после показа меню (мс):
+    # сначала меню успевает отрисоваться
+    PREWARM_DELAY = 100
+
+    def __init__(self, main_window):
+        self.main_window = main_window
+        self.game_window = None
+        self.leaderboard_window = None
+
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.dispose)
+
+    def prewarm(self):
+        """Создание окон в фоне цикла событий после показа меню"""
+        QTimer.singleShot(self.PREWARM_DELAY, self._prewarm_game)
+
+    def _prewarm_game(self):
+        """Создание игрового окна, затем - следующим проходом - окна рекордов"""
+        self.get_game_window()
+        QTimer.singleShot(0, self.get_leaderboard_window)
+
+    def get_game_window(self):
+        """Игровое окно (создаётся при первом обращении)"""
+        if self.game_window is None:
+            # Импорт тянет за собой сцену, мир и NumPy
+            from ui.game_window import GameWindow
+            self.game_window = GameWindow(main_window=self.main_window)
+        return self.game_window
+
+    def get_leaderboard_window(self):
+        """Окно рекордов (создаётся при первом обращении)"""
+        if self.leaderboard_window is None:
+            from ui.leaderboard_window import LeaderboardWindow
+            self.leaderboard_window = LeaderboardWindow()
+        return self.leaderboard_window
+
+    def start_game(self):
+        """Новая игра в готовом окне"""
+        window = self.get_game_window()
+        window.new_game()
+        window.show()
+        return window
+
+    def show_leaderboard(self):
+        """Показ таблицы рекордов со свежими данными"""
+        window = self.get_leaderboard_window()
+        window.load_leaderboard()
+        window.show()
+        window.raise_()
+        window.activateWindow()
+        return window
+
+    def dispose(self):
+        """Освобождение окон при выходе из программы
+
+        Цикл событий уже остановлен, и deleteLater не сработал бы: окна
+        без родителя удаляются вместе с последней ссылкой на них.
+        """
+        if self.game_window is not None:
+            self.game_window.dispose()
+            self.game_window = None
+        if self.leaderboard_window is not None:
+            self.leaderboard_window.close()
+            self.leaderboard_window = None